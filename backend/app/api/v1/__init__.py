@@ -5,14 +5,16 @@ Includes all v1 API endpoints
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 from .transactions import router as transactions_router
 from .zk_proofs import router as zk_proofs_router
 from .anchor import router as anchor_router
 from app.routes.user import router as user_router
 from app.routes.simple_auth import router as simple_auth_router
 
-# Create main v1 router
-api_router = APIRouter(prefix="/v1")
+# Create main v1 router; orjson serializes responses in C, which is
+# 3-10x faster than stdlib json for large payloads
+api_router = APIRouter(prefix="/v1", default_response_class=ORJSONResponse)
 
 # Include routers
 api_router.include_router(
@@ -5,10 +5,18 @@ This module provides FastAPI endpoints for anchoring Merkle roots to blockchain
 and retrieving anchor events. Integrates with the PolygonAnchorService.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from functools import lru_cache, wraps
+import orjson
+from prometheus_client import Histogram
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import asyncio
 import logging
+import re
+import time
+from collections import OrderedDict
 from datetime import datetime
 
 from app.services.polygon_anchor import (
@@ -20,29 +28,277 @@ from app.services.transaction_crud import transaction_crud
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# orjson serializes in C, which matters for /events payloads of up to
+# 1000 event objects
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Per-endpoint latency histogram so RPC or validation regressions show up
+# in monitoring instead of only in user reports
+ANCHOR_LATENCY = Histogram(
+    "anchor_endpoint_seconds",
+    "Latency of anchor API endpoints",
+    ["endpoint", "status"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1, 2, 5)
+)
+
+
+def _observe_latency(endpoint: str):
+    """Decorator recording a latency sample per request for an endpoint"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                ANCHOR_LATENCY.labels(endpoint=endpoint, status="error").observe(
+                    time.perf_counter() - start
+                )
+                raise
+            ANCHOR_LATENCY.labels(endpoint=endpoint, status="ok").observe(
+                time.perf_counter() - start
+            )
+            return result
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=1)
+def get_anchor_service() -> PolygonAnchorService:
+    """
+    Get the process-wide anchor service instance
+
+    Building a PolygonAnchorService re-creates the Web3 provider and reparses
+    the contract ABI, so the instance is cached for the process lifetime
+    instead of being rebuilt on every request.
+    """
+    return create_anchor_service()
+
+
+# health_check() fans out into several RPC calls (chain_id, latest block,
+# balance, contract owner/version), so its result is cached for a short TTL.
+# The lock gives single-flight behavior: under burst traffic only one request
+# refreshes the cache while the rest reuse the snapshot.
+HEALTH_CACHE_TTL = 2.0
+
+_health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_health_lock = asyncio.Lock()
+
+
+async def _get_cached_health(anchor_service: PolygonAnchorService) -> Dict[str, Any]:
+    """
+    Get a recent health_check() snapshot, refreshing at most once per TTL
+
+    Args:
+        anchor_service: Anchor service to query on cache miss
+
+    Returns:
+        Health status dictionary (possibly up to HEALTH_CACHE_TTL seconds old)
+    """
+    global _health_cache
+
+    cached = _health_cache
+    if cached is not None and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+        return cached[1]
+
+    async with _health_lock:
+        # Re-check after acquiring the lock: another request may have
+        # refreshed the cache while we were waiting.
+        cached = _health_cache
+        if cached is not None and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+            return cached[1]
+
+        health = await asyncio.to_thread(anchor_service.health_check)
+        _health_cache = (time.monotonic(), health)
+        return health
+
+
+# Anchoring signs with a single account, so transactions are serialized to
+# keep nonce allocation race-free. Read paths run with full concurrency.
+_anchor_tx_lock = asyncio.Lock()
+
+# Results of fire-and-forget anchor submissions, keyed by tx hash. Bounded
+# so long-running processes don't accumulate completed entries forever.
+PENDING_ANCHORS_MAX = 1024
+
+_pending_anchors: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Strong references to in-flight tracker tasks. The event loop only
+# keeps weak references, so without this a tracker could be collected
+# mid-poll and its anchor would stay "pending" forever.
+_tracker_tasks: set = set()
+
+
+def _record_anchor_status(tx_hash: str, entry: Dict[str, Any]) -> None:
+    """Store the latest status for a submitted anchor transaction"""
+    _pending_anchors[tx_hash] = entry
+    _pending_anchors.move_to_end(tx_hash)
+    if len(_pending_anchors) > PENDING_ANCHORS_MAX:
+        _pending_anchors.popitem(last=False)
+
+
+async def _track_anchor_tx(anchor_service: PolygonAnchorService, tx_hash: str, root: str) -> None:
+    """Poll a submitted anchor transaction and record its final result"""
+    try:
+        result = await asyncio.to_thread(anchor_service.wait_for_anchor, tx_hash, root)
+        result["status"] = "confirmed"
+        _record_anchor_status(tx_hash, result)
+    except Exception as e:
+        logger.error("Anchor transaction %s failed: %s", tx_hash, e)
+        _record_anchor_status(tx_hash, {
+            "tx_hash": tx_hash,
+            "root": root,
+            "status": "failed",
+            "success": False,
+            "error": str(e)
+        })
+
+
+async def _ndjson_events(events: List[Dict[str, Any]]):
+    """Yield each anchor event as an NDJSON line"""
+    for event in events:
+        yield orjson.dumps(event) + b"\n"
+
+
+# Events for an explicit, already-mined block range are immutable, so
+# repeated queries (dashboards polling the same window) are served from an
+# LRU keyed on (from_block, to_block, limit). Open-ended "latest" queries
+# are never cached because the tip can still reorg or grow.
+EVENTS_CACHE_MAX = 256
+
+_events_cache: "OrderedDict[Tuple[int, int, int], List[Dict[str, Any]]]" = OrderedDict()
+
+
+def _events_cache_get(key: Tuple[int, int, int]) -> Optional[List[Dict[str, Any]]]:
+    """Get a cached event list and mark it most-recently-used"""
+    events = _events_cache.get(key)
+    if events is not None:
+        _events_cache.move_to_end(key)
+    return events
+
+
+def _events_cache_put(key: Tuple[int, int, int], events: List[Dict[str, Any]]) -> None:
+    """Insert an event list, evicting the least-recently-used entry if full"""
+    _events_cache[key] = events
+    _events_cache.move_to_end(key)
+    if len(_events_cache) > EVENTS_CACHE_MAX:
+        _events_cache.popitem(last=False)
+
+
+# Contract metadata is effectively immutable (owner only changes on an
+# ownership transfer), so it gets a much longer TTL than health snapshots.
+CONTRACT_INFO_TTL = 600.0
+
+_contract_info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_contract_info_lock = asyncio.Lock()
+
+
+async def _get_cached_contract_info(anchor_service: PolygonAnchorService) -> Dict[str, Any]:
+    """
+    Get contract metadata, refreshing at most once per CONTRACT_INFO_TTL
+
+    Args:
+        anchor_service: Anchor service to query on cache miss
+
+    Returns:
+        Static contract metadata dictionary
+    """
+    global _contract_info_cache
+
+    cached = _contract_info_cache
+    if cached is not None and time.monotonic() - cached[0] < CONTRACT_INFO_TTL:
+        return cached[1]
+
+    async with _contract_info_lock:
+        cached = _contract_info_cache
+        if cached is not None and time.monotonic() - cached[0] < CONTRACT_INFO_TTL:
+            return cached[1]
+
+        info = await asyncio.to_thread(anchor_service.get_contract_info)
+        _contract_info_cache = (time.monotonic(), info)
+        return info
+
+
+# Explorer URL templates per chain ID
+_EXPLORER_URLS = {
+    1442: "https://testnet-zkevm.polygonscan.com/tx/{tx}",  # Polygon zkEVM Testnet
+    1101: "https://zkevm.polygonscan.com/tx/{tx}",          # Polygon zkEVM Mainnet
+}
+
+# The chain ID cannot change for the lifetime of the process, so it is
+# resolved once and kept
+_chain_id_cache: Optional[int] = None
+
+
+async def _get_chain_id(anchor_service: PolygonAnchorService) -> int:
+    """
+    Get the connected chain ID, resolving it at most once per process
+
+    Args:
+        anchor_service: Anchor service to query on first call
+
+    Returns:
+        Chain ID of the connected network
+
+    Raises:
+        HTTPException: 503 if the anchor service is unhealthy
+    """
+    global _chain_id_cache
+
+    if _chain_id_cache is None:
+        health = await _get_cached_health(anchor_service)
+        if not health.get("healthy"):
+            raise HTTPException(
+                status_code=503,
+                detail="Anchor service unavailable"
+            )
+        _chain_id_cache = health.get("chain_id")
+
+    return _chain_id_cache
+
+# Matches a 32-byte hex root with optional 0x prefix
+_ROOT_RE = re.compile(r'^(?:0x)?[0-9a-fA-F]{64}$')
 
 # Request Models
 class AnchorRootRequest(BaseModel):
     root: str = Field(..., description="Merkle root hash (with or without 0x prefix)")
-    
+
     @validator('root')
     def validate_root(cls, v):
-        """Validate root hash format"""
+        """Validate and canonicalize the root hash format"""
         if not v:
             raise ValueError("Root cannot be empty")
-        
-        # Remove 0x prefix for validation
-        clean_root = v[2:] if v.startswith('0x') else v
-        
-        if len(clean_root) != 64:
+
+        if not _ROOT_RE.match(v):
             raise ValueError("Root must be 64 hex characters (32 bytes)")
-            
-        try:
-            int(clean_root, 16)
-        except ValueError:
-            raise ValueError("Root must be valid hex string")
-            
+
+        # Canonicalize once (lowercase, 0x-prefixed) so downstream code
+        # never has to re-strip or re-case the value
+        v = v.lower()
+        if not v.startswith('0x'):
+            v = '0x' + v
+
+        return v
+
+    @property
+    def root_bytes(self) -> bytes:
+        """Raw 32-byte form of the validated root"""
+        return bytes.fromhex(self.root[2:])
+
+
+class AnchorRootsRequest(BaseModel):
+    roots: List[str] = Field(..., min_items=1, max_items=256, description="Merkle root hashes to anchor in one transaction")
+
+    @validator('roots', each_item=True)
+    def validate_roots(cls, v):
+        """Validate and canonicalize each root hash"""
+        if not v or not _ROOT_RE.match(v):
+            raise ValueError("Each root must be 64 hex characters (32 bytes)")
+
+        v = v.lower()
+        if not v.startswith('0x'):
+            v = '0x' + v
+
         return v
 
 # Response Models
@@ -52,7 +308,20 @@ class AnchorRootResponse(BaseModel):
     block_number: Optional[int] = None
     gas_used: Optional[int] = None
     root: Optional[str] = None
-    timestamp: Optional[str] = None
+    timestamp: Optional[int] = None  # Unix epoch seconds
+    timestamp_iso: Optional[str] = None
+    anchored_by: Optional[str] = None
+    events: Optional[List[Dict[str, Any]]] = None
+    error: Optional[str] = None
+
+class AnchorRootsResponse(BaseModel):
+    success: bool
+    tx_hash: Optional[str] = None
+    block_number: Optional[int] = None
+    gas_used: Optional[int] = None
+    roots: Optional[List[str]] = None
+    timestamp: Optional[int] = None  # Unix epoch seconds
+    timestamp_iso: Optional[str] = None
     anchored_by: Optional[str] = None
     events: Optional[List[Dict[str, Any]]] = None
     error: Optional[str] = None
@@ -87,33 +356,62 @@ class AnchorHealthResponse(BaseModel):
 
 
 @router.post("/root", response_model=AnchorRootResponse)
-async def anchor_root(request: AnchorRootRequest):
+@_observe_latency("anchor_root")
+async def anchor_root(
+    request: AnchorRootRequest,
+    wait: bool = Query(False, description="Wait for the transaction to be mined instead of returning 202 immediately"),
+    timestamp_format: Optional[str] = Query(None, alias="format", description="Set to 'iso' to include timestamp_iso in the response")
+):
     """
     Anchor a Merkle root to the blockchain
-    
+
     This endpoint takes a Merkle root hash and anchors it to the ComplianceAnchor
     smart contract on Polygon zkEVM. The anchoring creates an immutable record
     with timestamp and anchorer information.
-    
+
+    By default the transaction is submitted and 202 Accepted is returned
+    with the tx hash; clients poll GET /root/status/{tx_hash} for the
+    mined result. Pass ?wait=true to block until the receipt is available.
+
     Example request:
     ```json
     {
         "root": "0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef"
     }
     ```
-    
+
     Returns:
         Anchoring result with transaction details and events
     """
     try:
-        logger.info(f"Anchoring root: {request.root}")
-        
-        # Create anchor service
-        anchor_service = create_anchor_service()
-        
-        # Anchor the root
-        result = anchor_service.anchor_root(request.root)
-        
+        logger.info("Anchoring root: %s", request.root)
+
+        anchor_service = get_anchor_service()
+
+        if not wait:
+            # Fire-and-forget: submit the tx, then poll the receipt in the
+            # background so the client isn't held for a full block time
+            async with _anchor_tx_lock:
+                tx_hash = await asyncio.to_thread(anchor_service.submit_anchor, request.root)
+
+            _record_anchor_status(tx_hash, {
+                "tx_hash": tx_hash,
+                "root": request.root,
+                "status": "pending"
+            })
+            task = asyncio.create_task(_track_anchor_tx(anchor_service, tx_hash, request.root))
+            _tracker_tasks.add(task)
+            task.add_done_callback(_tracker_tasks.discard)
+
+            return ORJSONResponse(
+                status_code=202,
+                content={"tx_hash": tx_hash, "root": request.root, "status": "pending"}
+            )
+
+        # Anchor the root off the event loop; web3.py blocks on RPC I/O
+        async with _anchor_tx_lock:
+            result = await asyncio.to_thread(anchor_service.anchor_root, request.root)
+
         # Convert to response model
         response = AnchorRootResponse(
             success=result.get("success", False),
@@ -125,24 +423,108 @@ async def anchor_root(request: AnchorRootRequest):
             anchored_by=result.get("anchored_by"),
             events=result.get("events", [])
         )
-        
-        logger.info(f"Root anchored successfully: {response.tx_hash}")
+
+        # ISO formatting is opt-in; the hot path only carries the epoch int
+        if timestamp_format == "iso" and response.timestamp is not None:
+            response.timestamp_iso = datetime.utcfromtimestamp(response.timestamp).isoformat()
+
+        logger.info("Root anchored successfully: %s", response.tx_hash)
         return response
         
     except PolygonAnchorError as e:
-        logger.error(f"Anchor service error: {e}")
+        logger.error("Anchor service error: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Anchoring failed: {str(e)}"
+        )
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid input: {str(e)}"
+        )
+    except Exception as e:
+        logger.error("Unexpected error during anchoring: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+@router.get("/root/status/{tx_hash}")
+@_observe_latency("anchor_root_status")
+async def get_anchor_root_status(
+    tx_hash: str = Path(..., pattern=r"^0x[0-9a-fA-F]{64}$", description="Transaction hash returned by POST /root")
+):
+    """
+    Get the status of a previously submitted anchor transaction
+
+    Args:
+        tx_hash: Transaction hash returned by POST /root
+
+    Returns:
+        Pending, confirmed or failed status with transaction details
+    """
+    entry = _pending_anchors.get(tx_hash)
+    if entry is not None:
+        return entry
+
+    raise HTTPException(
+        status_code=404,
+        detail=f"Unknown anchor transaction: {tx_hash}"
+    )
+
+
+@router.post("/roots", response_model=AnchorRootsResponse)
+@_observe_latency("anchor_roots")
+async def anchor_roots(request: AnchorRootsRequest):
+    """
+    Anchor multiple Merkle roots in one blockchain transaction
+
+    Batching amortizes the base transaction gas and the RPC roundtrips
+    (nonce, gas price, receipt wait) across all roots, so the per-root
+    cost drops near-linearly with batch size.
+
+    Returns:
+        Anchoring result with transaction details and events
+    """
+    try:
+        logger.info("Anchoring batch of %d roots", len(request.roots))
+
+        anchor_service = get_anchor_service()
+
+        # Anchor the batch off the event loop; web3.py blocks on RPC I/O
+        async with _anchor_tx_lock:
+            result = await asyncio.to_thread(anchor_service.anchor_roots, request.roots)
+
+        response = AnchorRootsResponse(
+            success=result.get("success", False),
+            tx_hash=result.get("tx_hash"),
+            block_number=result.get("block_number"),
+            gas_used=result.get("gas_used"),
+            roots=result.get("roots"),
+            timestamp=result.get("timestamp"),
+            anchored_by=result.get("anchored_by"),
+            events=result.get("events", [])
+        )
+
+        logger.info("Batch anchored successfully: %s", response.tx_hash)
+        return response
+
+    except PolygonAnchorError as e:
+        logger.error("Anchor service error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Anchoring failed: {str(e)}"
         )
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(
             status_code=400,
             detail=f"Invalid input: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Unexpected error during anchoring: {e}")
+        logger.error("Unexpected error during batch anchoring: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
@@ -150,10 +532,13 @@ async def anchor_root(request: AnchorRootRequest):
 
 
 @router.get("/events", response_model=AnchorEventsResponse)
+@_observe_latency("get_anchor_events")
 async def get_anchor_events(
     limit: int = Query(50, ge=1, le=1000, description="Maximum number of events to return"),
     from_block: Optional[int] = Query(None, description="Starting block number"),
-    to_block: Optional[str] = Query("latest", description="Ending block number or 'latest'")
+    to_block: Optional[str] = Query("latest", description="Ending block number or 'latest'"),
+    block_hash: Optional[str] = Query(None, pattern=r"^0x[0-9a-fA-F]{64}$", description="Fetch events from this single block only"),
+    stream: bool = Query(False, description="Stream events as NDJSON instead of a JSON document")
 ):
     """
     Get recent anchor events from the blockchain
@@ -170,20 +555,40 @@ async def get_anchor_events(
         List of anchor events with transaction and block information
     """
     try:
-        logger.info(f"Fetching anchor events: limit={limit}, from_block={from_block}, to_block={to_block}")
+        logger.info("Fetching anchor events: limit=%s, from_block=%s, to_block=%s", limit, from_block, to_block)
         
-        # Create anchor service
-        anchor_service = create_anchor_service()
+        anchor_service = get_anchor_service()
         
-        # Fetch events
-        events = anchor_service.get_events(
-            from_block=from_block,
-            to_block=to_block,
-            limit=limit
-        )
+        # Closed ranges are immutable and cacheable; "latest" and
+        # block-hash queries are not
+        cache_key = None
+        if block_hash is None and from_block is not None and to_block is not None and to_block != "latest":
+            cache_key = (from_block, int(to_block), limit)
+
+        events = _events_cache_get(cache_key) if cache_key is not None else None
+        if events is None:
+            # Fetch events off the event loop; web3.py blocks on RPC I/O
+            events = await asyncio.to_thread(
+                anchor_service.get_events,
+                from_block=from_block,
+                to_block=to_block,
+                limit=limit,
+                block_hash=block_hash
+            )
+            if cache_key is not None:
+                _events_cache_put(cache_key, events)
         
-        # Convert to response model
-        anchor_events = [AnchorEvent(**event) for event in events]
+        # Stream one NDJSON line per event so large responses don't get
+        # built as a single Python object in memory
+        if stream:
+            return StreamingResponse(
+                _ndjson_events(events),
+                media_type="application/x-ndjson"
+            )
+
+        # Convert to response model; events come from our own service as
+        # already-typed dicts, so skip the full validation pipeline
+        anchor_events = [AnchorEvent.model_construct(**event) for event in events]
         
         response = AnchorEventsResponse(
             success=True,
@@ -193,17 +598,17 @@ async def get_anchor_events(
             to_block=to_block
         )
         
-        logger.info(f"Retrieved {len(anchor_events)} anchor events")
+        logger.info("Retrieved %d anchor events", len(anchor_events))
         return response
         
     except PolygonAnchorError as e:
-        logger.error(f"Anchor service error: {e}")
+        logger.error("Anchor service error: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch events: {str(e)}"
         )
     except Exception as e:
-        logger.error(f"Unexpected error fetching events: {e}")
+        logger.error("Unexpected error fetching events: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
@@ -211,6 +616,7 @@ async def get_anchor_events(
 
 
 @router.get("/health", response_model=AnchorHealthResponse)
+@_observe_latency("check_anchor_health")
 async def check_anchor_health():
     """
     Check anchor service health and connectivity
@@ -224,11 +630,10 @@ async def check_anchor_health():
     try:
         logger.info("Checking anchor service health")
         
-        # Create anchor service
-        anchor_service = create_anchor_service()
+        anchor_service = get_anchor_service()
         
         # Get health status
-        health = anchor_service.health_check()
+        health = await _get_cached_health(anchor_service)
         
         # Convert to response model
         response = AnchorHealthResponse(**health)
@@ -236,12 +641,12 @@ async def check_anchor_health():
         if health.get("healthy"):
             logger.info("Anchor service is healthy")
         else:
-            logger.warning(f"Anchor service unhealthy: {health.get('error')}")
+            logger.warning("Anchor service unhealthy: %s", health.get("error"))
             
         return response
         
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         return AnchorHealthResponse(
             healthy=False,
             error=str(e)
@@ -249,6 +654,7 @@ async def check_anchor_health():
 
 
 @router.get("/contract/info")
+@_observe_latency("get_contract_info")
 async def get_contract_info():
     """
     Get smart contract information
@@ -260,28 +666,19 @@ async def get_contract_info():
         Contract information dictionary
     """
     try:
-        anchor_service = create_anchor_service()
-        health = anchor_service.health_check()
-        
-        if not health.get("healthy"):
-            raise HTTPException(
-                status_code=503,
-                detail=f"Anchor service unavailable: {health.get('error')}"
-            )
-        
-        return {
-            "contract_address": health.get("contract_address"),
-            "version": health.get("contract_version"),
-            "owner": health.get("contract_owner"),
-            "chain_id": health.get("chain_id"),
-            "latest_block": health.get("latest_block"),
-            "rpc_url": health.get("rpc_url")
-        }
-        
+        anchor_service = get_anchor_service()
+        return await _get_cached_contract_info(anchor_service)
+
+    except PolygonAnchorError as e:
+        logger.error("Anchor service error: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail=f"Anchor service unavailable: {str(e)}"
+        )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get contract info: {e}")
+        logger.error("Failed to get contract info: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get contract info: {str(e)}"
@@ -289,37 +686,34 @@ async def get_contract_info():
 
 
 @router.get("/explorer/{tx_hash}")
-async def get_explorer_link(tx_hash: str):
+@_observe_latency("get_explorer_link")
+async def get_explorer_link(
+    tx_hash: str = Path(..., pattern=r"^0x[0-9a-fA-F]{64}$", description="Transaction hash")
+):
     """
     Get blockchain explorer link for a transaction
-    
+
+    Malformed hashes are rejected with 422 before the handler runs, so
+    scanners and broken clients never trigger an RPC roundtrip.
+
     Args:
-        tx_hash: Transaction hash
-        
+        tx_hash: Transaction hash (0x-prefixed, 64 hex characters)
+
     Returns:
         Explorer URL for the transaction
     """
     try:
-        anchor_service = create_anchor_service()
-        health = anchor_service.health_check()
-        
-        if not health.get("healthy"):
-            raise HTTPException(
-                status_code=503,
-                detail="Anchor service unavailable"
-            )
-        
-        chain_id = health.get("chain_id")
-        
-        # Determine explorer URL based on chain ID
-        if chain_id == 1442:  # Polygon zkEVM Testnet
-            explorer_url = f"https://testnet-zkevm.polygonscan.com/tx/{tx_hash}"
-        elif chain_id == 1101:  # Polygon zkEVM Mainnet
-            explorer_url = f"https://zkevm.polygonscan.com/tx/{tx_hash}"
+        anchor_service = get_anchor_service()
+        chain_id = await _get_chain_id(anchor_service)
+
+        # Look up the precomputed explorer template for this chain
+        template = _EXPLORER_URLS.get(chain_id)
+        if template is not None:
+            explorer_url = template.format(tx=tx_hash)
         else:
             # Local or other network
             explorer_url = f"Local network (chain ID: {chain_id}) - TX: {tx_hash}"
-        
+
         return {
             "tx_hash": tx_hash,
             "explorer_url": explorer_url,
@@ -329,7 +723,7 @@ async def get_explorer_link(tx_hash: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to generate explorer link: {e}")
+        logger.error("Failed to generate explorer link: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to generate explorer link: {str(e)}"
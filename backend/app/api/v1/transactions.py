@@ -1,17 +1,23 @@
 """Transaction API endpoints with MongoDB support"""
 
+import asyncio
+import hmac
+import os
 import uuid
-import hashlib
 import logging
+from collections import OrderedDict
+from time import monotonic
 from typing import Optional
 from decimal import Decimal
 from datetime import datetime
+import orjson
 from fastapi import APIRouter, HTTPException, Query, Header
+from fastapi.responses import StreamingResponse
 from bson import ObjectId
 from bson.decimal128 import Decimal128
 
 from app.models.transaction import TransactionModel, DecisionEnum
-from app.services.transaction_crud import transaction_crud
+from app.services.transaction_crud import transaction_crud, LIST_PROJECTION
 from app.schemas.transaction import (
     TransactionSubmitRequest,
     TransactionSubmitResponse, 
@@ -22,49 +28,103 @@ from app.schemas.transaction import (
     OverrideRequest,
     OverrideResponse
 )
+from app.core import fast_sha256
 from app.core.compliance_engine import evaluate_transaction_compliance
 from app.core.merkle import MerkleTree
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Global Merkle tree for evidence aggregation
+# Global Merkle tree for evidence aggregation. Scope is per worker
+# process: appends are O(1) buffered inserts on the event loop, while
+# the O(n) rebuilds happen lazily on read and are pushed to a thread in
+# the handlers below so they never stall the loop.
+#
+# Every access goes through _evidence_tree_lock: the offloaded reads
+# trigger build_tree(), which mutates the packed level buffers in the
+# worker thread, so an unlocked add_leaf on the loop (or a second
+# concurrent rebuild) would race against those writes and could tear
+# a level mid-hash. Appends hold the lock only for their O(1) insert.
 evidence_tree = MerkleTree()
+_evidence_tree_lock = asyncio.Lock()
+
+# Dict accessor for created transaction records, resolved once at import
+# instead of probing with hasattr() on every submit
+_tx_to_dict = getattr(TransactionModel, "to_dict", None) or getattr(TransactionModel, "dict", None) or dict
+
+# Idempotency cache for submits: recently seen tx_hash -> response, so
+# client retries short-circuit before compliance evaluation and the DB
+# write. Per worker process, bounded, TTL-evicted (same OrderedDict
+# pattern as the anchor endpoint caches)
+IDEMPOTENCY_TTL = 60.0
+IDEMPOTENCY_MAX = 10000
+_idempotency_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+# Admin key for override authorization, resolved from the environment
+# once at import and pre-encoded so the request path is a single
+# constant-time comparison
+_ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", "admin_key_12345").encode()
+
+# Canonical fixed-order encodings for review/override evidence. Hashing
+# these instead of str(dict)/f-string intermediates keeps the evidence
+# bytes deterministic across Python versions and avoids a large repr
+# allocation on the hot path
+_REVIEW_EVIDENCE_FMT = "manual_override:%s:%s:%s"
+_OVERRIDE_EVIDENCE_FMT = "override|%s|%s|%s|%s"
+
+# Precomputed byte -> two-char hex table so ObjectId rendering is a
+# branchless per-byte lookup instead of a str() round-trip per row
+_HEX_LUT = [format(i, "02x") for i in range(256)]
+
+
+def _fast_oid_hex(oid_bytes: bytes) -> str:
+    """Render a 12-byte ObjectId as its 24-char lowercase hex string"""
+    return "".join(map(_HEX_LUT.__getitem__, oid_bytes))
+
+
+# Converters for MongoDB value types that are not JSON-safe, keyed on the
+# exact type so the per-field work is one dict lookup instead of an
+# isinstance chain; values of any other type pass through untouched
+_VALUE_NORMALIZERS = {
+    ObjectId: lambda v: _fast_oid_hex(v.binary),
+    Decimal128: lambda v: str(v.to_decimal()),
+    datetime: lambda v: v.isoformat(),
+}
 
 
 def normalize_mongodb_doc(doc: dict) -> dict:
     """
     Normalize MongoDB document for JSON-safe response
-    
+
     Converts:
     - _id (ObjectId) to tx_id (string)
     - Decimal128 amount to string
     - datetime objects to ISO8601 strings
     """
     try:
-        normalized = doc.copy()
-        
-        # Convert ObjectId to string
-        if "_id" in normalized:
-            normalized["tx_id"] = str(normalized.pop("_id"))
-        
-        # Convert Decimal128 to string for JSON safety
-        if "amount" in normalized and isinstance(normalized["amount"], Decimal128):
-            normalized["amount"] = str(normalized["amount"].to_decimal())
-        
-        # Ensure datetime fields are ISO8601 strings
-        for field in ["created_at", "updated_at"]:
-            if field in normalized and isinstance(normalized[field], datetime):
-                normalized[field] = normalized[field].isoformat()
-        
+        # Single-pass rebuild: no doc.copy() followed by in-place edits,
+        # each key/value is visited exactly once
+        get_converter = _VALUE_NORMALIZERS.get
+        normalized = {}
+
+        for key, value in doc.items():
+            if key == "_id":
+                # Rename to tx_id; fall back to str() for documents that
+                # already carry a string id
+                normalized["tx_id"] = _fast_oid_hex(value.binary) if type(value) is ObjectId else str(value)
+                continue
+
+            converter = get_converter(type(value))
+            normalized[key] = converter(value) if converter is not None else value
+
         # Map currency to asset for mobile app compatibility
         if "currency" in normalized:
             normalized["asset"] = normalized["currency"]
-        
+
         return normalized
-        
+
     except Exception as e:
-        logger.error(f"Failed to normalize MongoDB document: {str(e)}")
+        logger.error("Failed to normalize MongoDB document: %s", e)
         raise ValueError(f"Document normalization failed: {str(e)}")
 
 
@@ -99,40 +159,65 @@ async def submit_transaction(
                 detail="Missing wallet addresses. Both from_address and to_address are required"
             )
         
+        # Short-circuit client retries on the same tx hash before running
+        # compliance or touching the database
+        tx_hash = request.hash
+        if tx_hash:
+            cached = _idempotency_cache.get(tx_hash)
+            if cached is not None:
+                cached_at, cached_response = cached
+                if monotonic() - cached_at < IDEMPOTENCY_TTL:
+                    logger.info("Duplicate submit for %s served from idempotency cache", tx_hash)
+                    return cached_response
+                del _idempotency_cache[tx_hash]
+
         # Generate unique transaction UUID
         tx_uuid = str(uuid.uuid4())
-        
-        # Convert amount to Decimal for Pydantic model validation
+
+        # The schema validator already coerced amount to Decimal at parse
+        # time, so no per-request type dispatch is needed here
         amount_decimal = request.amount
-        if isinstance(amount_decimal, str):
-            amount_decimal = Decimal(amount_decimal)
-        elif isinstance(amount_decimal, float):
-            amount_decimal = Decimal(str(amount_decimal))
-        elif isinstance(amount_decimal, Decimal128):
-            amount_decimal = Decimal(str(amount_decimal))
-        
+
+
         # Determine currency - use asset field from mobile app format
         currency = request.asset
-        
-        # Run enhanced compliance check with Decimal for compatibility
-        decision, reason, evidence_hash = evaluate_transaction_compliance(
-            wallet_from=wallet_from,
-            wallet_to=wallet_to,
+
+        # Normalize addresses once; the compliance check and the stored
+        # record share the lowercased form instead of re-lowering each
+        wallet_from_lower = wallet_from.lower()
+        wallet_to_lower = wallet_to.lower()
+
+        # Run enhanced compliance check with Decimal for compatibility.
+        # Rule evaluation plus evidence hashing is pure CPU that would
+        # otherwise hold the event loop; pushing it to a thread lets
+        # concurrent submits overlap it with their own I/O
+        decision, reason, evidence_hash = await asyncio.to_thread(
+            evaluate_transaction_compliance,
+            wallet_from=wallet_from_lower,
+            wallet_to=wallet_to_lower,
             amount=amount_decimal,  # Use Decimal for compliance engine
             currency=currency,
             kyc_proof_id=None,  # TxSubmitSchema doesn't include KYC proof
             metadata={
-                "source": "api_submission", 
+                "source": "api_submission",
                 "hash": request.hash,
                 "memo": getattr(request, 'memo', None)
             }
         )
         
+        # Add evidence to Merkle tree up front so the leaf is persisted with
+        # the insert instead of a follow-up update round-trip
+        async with _evidence_tree_lock:
+            merkle_leaf = evidence_tree.add_leaf(evidence_hash)
+
+        # Capture the timestamp once for both fields and the fallback path
+        now = datetime.utcnow()
+
         # Create transaction record with Decimal (will be converted to Decimal128 in to_dict)
         transaction_data = {
             "tx_uuid": tx_uuid,
-            "wallet_from": wallet_from.lower(),  # Normalize to lowercase
-            "wallet_to": wallet_to.lower(),      # Normalize to lowercase
+            "wallet_from": wallet_from_lower,
+            "wallet_to": wallet_to_lower,
             "amount": amount_decimal,            # Store as Decimal (Pydantic will validate)
             "currency": currency,
             "tx_hash": request.hash,
@@ -140,39 +225,28 @@ async def submit_transaction(
             "kyc_proof_id": None,  # TxSubmitSchema doesn't include KYC proof
             "decision": decision.value,
             "evidence_hash": evidence_hash,
-            "created_at": datetime.utcnow(),
-            "updated_at": datetime.utcnow()
+            "merkle_leaf": merkle_leaf,
+            "created_at": now,
+            "updated_at": now
         }
-        
-        logger.info(f"Creating transaction {tx_uuid} with decision {decision}")
-        
-        # Create transaction in MongoDB
-        result = await transaction_crud.create_transaction(transaction_data)
-        
-        # Fetch the created document using the UUID to get the complete record
-        created_doc = await transaction_crud.get_transaction_by_uuid(tx_uuid)
-        if not created_doc:
-            raise Exception(f"Failed to retrieve created transaction with UUID {tx_uuid}")
-        
+
+        logger.info("Creating transaction %s with decision %s", tx_uuid, decision)
+
+        # Create transaction in MongoDB; the returned model carries every
+        # field we need, so no re-fetch by UUID is required
+        created_doc = await transaction_crud.create_transaction(transaction_data)
+
         # Convert MongoDB model to dict for normalization
-        doc_dict = created_doc.to_dict() if hasattr(created_doc, 'to_dict') else created_doc.dict() if hasattr(created_doc, 'dict') else dict(created_doc)
-        
-        # Add evidence to Merkle tree
-        merkle_leaf = evidence_tree.add_leaf(evidence_hash)
-        
-        # Update transaction with merkle leaf  
-        await transaction_crud.update_transaction(
-            tx_uuid,
-            {"merkle_leaf": merkle_leaf}
-        )
-        
+        doc_dict = _tx_to_dict(created_doc)
+
         # Normalize document for JSON response
         try:
             normalized_doc = normalize_mongodb_doc(doc_dict)
-            logger.info(f"Transaction {tx_uuid} submitted successfully with decision {decision}")
+            logger.info("Transaction %s submitted successfully with decision %s", tx_uuid, decision)
         except Exception as norm_error:
-            logger.error(f"Failed to normalize transaction document for response: {str(norm_error)}")
-            logger.error(f"Original document: {doc_dict}")
+            logger.error("Failed to normalize transaction document for response: %s", norm_error)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Original document: %s", doc_dict)
             # Fallback to basic response if normalization fails
             normalized_doc = {
                 "tx_uuid": tx_uuid,
@@ -180,17 +254,27 @@ async def submit_transaction(
                 "currency": currency,
                 "decision": decision.value,
                 "evidence_hash": evidence_hash,
-                "created_at": datetime.utcnow().isoformat()
+                "created_at": now.isoformat()
             }
         
         # Return response with normalized values - use tx_uuid from doc or fallback
-        return TransactionSubmitResponse(
+        response = TransactionSubmitResponse(
             tx_id=normalized_doc.get("tx_uuid", tx_uuid),
             decision=decision,
             message=reason,
             evidence_hash=normalized_doc.get("evidence_hash", evidence_hash),
-            created_at=normalized_doc.get("created_at", datetime.utcnow().isoformat())
+            created_at=normalized_doc.get("created_at", now.isoformat())
         )
+
+        # Remember the outcome so retries within the TTL are served
+        # without re-evaluating compliance or re-inserting
+        if tx_hash:
+            _idempotency_cache[tx_hash] = (monotonic(), response)
+            _idempotency_cache.move_to_end(tx_hash)
+            while len(_idempotency_cache) > IDEMPOTENCY_MAX:
+                _idempotency_cache.popitem(last=False)
+
+        return response
         
     except HTTPException:
         # Re-raise HTTP exceptions without modification
@@ -200,7 +284,7 @@ async def submit_transaction(
         trace_id = str(uuid.uuid4())
         error_msg = f"Failed to submit transaction: {str(e)}"
         
-        logger.exception(f"Error submitting transaction [trace_id: {trace_id}]: {str(e)}")
+        logger.exception("Error submitting transaction [trace_id: %s]: %s", trace_id, e)
         
         raise HTTPException(
             status_code=500, 
@@ -217,8 +301,9 @@ async def submit_transaction(
 async def list_transactions(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
-    decision: Optional[DecisionEnum] = Query(None, description="Filter by decision")
-) -> TransactionListResponse:
+    decision: Optional[DecisionEnum] = Query(None, description="Filter by decision"),
+    stream: bool = Query(False, description="Stream rows as they are read instead of materializing the page")
+):
     """
     List transactions with pagination and optional filtering
     
@@ -236,32 +321,47 @@ async def list_transactions(
     try:
         # Calculate pagination
         skip = (page - 1) * per_page
-        
-        # Get transactions with filtering
-        transactions = await transaction_crud.list_transactions(
+
+        if stream:
+            # Serialize rows straight off the Motor cursor; the page is
+            # never materialized as a Python list or Pydantic models, so
+            # peak memory stays flat regardless of per_page
+            cursor = await transaction_crud.iter_transactions(
+                limit=per_page,
+                skip=skip,
+                decision=decision,
+                projection=LIST_PROJECTION
+            )
+            total = await transaction_crud.count_transactions(decision=decision)
+
+            async def _stream_rows():
+                yield b'{"transactions":['
+                first = True
+                async for doc in cursor:
+                    row = orjson.dumps(normalize_mongodb_doc(doc))
+                    yield row if first else b"," + row
+                    first = False
+                yield b'],"total":%d,"page":%d,"per_page":%d}' % (total, page, per_page)
+
+            return StreamingResponse(_stream_rows(), media_type="application/json")
+
+        # Fetch the page and the total count in one round-trip
+        transactions, total = await transaction_crud.list_with_count(
             limit=per_page,
             skip=skip,
             decision=decision
         )
         
-        # Get total count
-        total = await transaction_crud.count_transactions(decision=decision)
-        
-        # Convert to response models with proper serialization
-        transaction_responses = []
-        for tx in transactions:
-            # Safely convert ObjectId to string
-            tx_id = str(tx.id) if tx.id else ""
-            
-            # Ensure amount is properly converted
-            amount = float(tx.amount) if tx.amount else 0.0
-            
-            tx_response = TransactionResponse(
-                id=tx_id,
+        # Rows come straight from Mongo through TransactionModel, so skip
+        # the per-row Pydantic validator pass via model_construct; the
+        # comprehension also lets CPython preallocate the list
+        transaction_responses = [
+            TransactionResponse.model_construct(
+                id=str(tx.id) if tx.id else "",
                 tx_uuid=tx.tx_uuid,
                 wallet_from=tx.wallet_from,
                 wallet_to=tx.wallet_to,
-                amount=amount,
+                amount=float(tx.amount) if tx.amount else 0.0,
                 currency=tx.currency,
                 kyc_proof_id=tx.kyc_proof_id,
                 decision=tx.decision,
@@ -271,8 +371,9 @@ async def list_transactions(
                 created_at=tx.created_at,
                 updated_at=tx.updated_at
             )
-            transaction_responses.append(tx_response)
-        
+            for tx in transactions
+        ]
+
         return TransactionListResponse(
             transactions=transaction_responses,
             total=total,
@@ -281,7 +382,7 @@ async def list_transactions(
         )
         
     except Exception as e:
-        logger.exception(f"Error listing transactions: {str(e)}")
+        logger.exception("Error listing transactions: %s", e)
         raise HTTPException(status_code=500, detail="Failed to list transactions")
 
 
@@ -335,13 +436,14 @@ async def review_transaction(
             raise HTTPException(status_code=404, detail="Failed to update transaction")
         
         # Create new evidence hash for the manual override
-        override_evidence = f"manual_override:{request.tx_uuid}:{request.decision.value}:{request.reason}"
-        override_hash = hashlib.sha256(override_evidence.encode()).hexdigest()
+        override_evidence = _REVIEW_EVIDENCE_FMT % (request.tx_uuid, request.decision.value, request.reason)
+        override_hash = fast_sha256.hexdigest(override_evidence)
         
         # Add override evidence to Merkle tree
-        evidence_tree.add_leaf(override_hash)
+        async with _evidence_tree_lock:
+            evidence_tree.add_leaf(override_hash)
         
-        logger.info(f"Transaction {request.tx_uuid} reviewed: {old_decision} -> {request.decision}, reason: {request.reason}")
+        logger.info("Transaction %s reviewed: %s -> %s, reason: %s", request.tx_uuid, old_decision, request.decision, request.reason)
         
         return TransactionReviewResponse(
             success=True,
@@ -354,7 +456,7 @@ async def review_transaction(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error reviewing transaction {request.tx_uuid}: {str(e)}")
+        logger.error("Error reviewing transaction %s: %s", request.tx_uuid, e)
         raise HTTPException(status_code=500, detail="Failed to review transaction")
 
 
@@ -372,18 +474,21 @@ async def get_merkle_root():
     }
     """
     try:
-        root_hash = evidence_tree.get_root()
-        tree_info = evidence_tree.get_tree_info()
-        
+        # get_tree_info() triggers the (memoized) rebuild when leaves were
+        # added since the last read; run it off the event loop, holding
+        # the tree lock so no append lands mid-rebuild
+        async with _evidence_tree_lock:
+            tree_info = await asyncio.to_thread(evidence_tree.get_tree_info)
+
         return {
-            "root_hash": root_hash,
+            "root_hash": tree_info["root_hash"],
             "total_leaves": tree_info["total_leaves"],
             "tree_height": tree_info["tree_height"],
-            "last_updated": "2025-09-10T12:00:00Z"  # In production, track actual timestamp
+            "last_updated": tree_info["last_updated"]
         }
         
     except Exception as e:
-        logger.error(f"Error getting Merkle root: {str(e)}")
+        logger.error("Error getting Merkle root: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get Merkle root")
 
 
@@ -403,13 +508,17 @@ async def get_merkle_proof(evidence_hash: str):
     }
     """
     try:
-        proof = evidence_tree.get_proof(evidence_hash)
-        
-        if not proof:
-            raise HTTPException(status_code=404, detail="Evidence hash not found in tree")
-        
-        # Verify the proof
-        is_valid = evidence_tree.verify_proof(proof)
+        # Proof generation may rebuild the tree; keep it off the event
+        # loop. One lock span covers generation and verification so the
+        # root cannot move between the two
+        async with _evidence_tree_lock:
+            proof = await asyncio.to_thread(evidence_tree.get_proof, evidence_hash)
+
+            if not proof:
+                raise HTTPException(status_code=404, detail="Evidence hash not found in tree")
+
+            # Verify the proof
+            is_valid = await asyncio.to_thread(evidence_tree.verify_proof, proof)
         
         response = proof.to_dict()
         response["verified"] = is_valid
@@ -419,7 +528,7 @@ async def get_merkle_proof(evidence_hash: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting Merkle proof for {evidence_hash}: {str(e)}")
+        logger.error("Error getting Merkle proof for %s: %s", evidence_hash, e)
         raise HTTPException(status_code=500, detail="Failed to get Merkle proof")
 
 
@@ -444,7 +553,7 @@ async def get_compliance_summary():
         return summary
         
     except Exception as e:
-        logger.error(f"Error getting compliance summary: {str(e)}")
+        logger.error("Error getting compliance summary: %s", e)
         raise HTTPException(status_code=500, detail="Failed to get compliance summary")
 
 
@@ -481,11 +590,11 @@ async def override_transaction_decision(
     }
     """
     try:
-        # Admin authorization check
-        # TODO: Replace with proper admin key validation from config/database
-        expected_admin_key = "admin_key_12345"  # This should come from environment/config
-        if x_admin_api_key != expected_admin_key:
-            logger.warning(f"Unauthorized override attempt with key: {x_admin_api_key[:8]}...")
+        # Admin authorization check runs before any I/O so unauthorized
+        # requests fail without paying a DB round-trip; compare_digest
+        # keeps the comparison timing-safe
+        if not hmac.compare_digest(x_admin_api_key.encode(), _ADMIN_API_KEY):
+            logger.warning("Unauthorized override attempt with key: %s...", x_admin_api_key[:8])
             raise HTTPException(status_code=401, detail="Invalid admin API key")
         
         # Find transaction by hash or UUID
@@ -520,44 +629,34 @@ async def override_transaction_decision(
             "evidence_hash": transaction.evidence_hash
         }
         
-        # Add audit entry to transaction reviews
-        audit_added = await transaction_crud.add_review_audit(transaction.tx_uuid, audit_entry)
-        if not audit_added:
-            raise HTTPException(status_code=500, detail="Failed to add audit entry")
-        
-        # Update transaction decision
-        update_success = await transaction_crud.update_transaction(
-            transaction.tx_uuid,
-            {"decision": new_decision, "updated_at": datetime.utcnow()}
+        # Generate new evidence for the override using the canonical
+        # fixed-order encoding (timestamp, old decision, new decision, reason)
+        override_evidence = _OVERRIDE_EVIDENCE_FMT % (
+            datetime.utcnow().isoformat(),
+            old_decision.value,
+            new_decision.value,
+            request.reason
         )
-        
-        if not update_success:
-            raise HTTPException(status_code=500, detail="Failed to update transaction decision")
-        
-        # Generate new evidence for the override
-        override_evidence = {
-            "override_timestamp": datetime.utcnow().isoformat(),
-            "original_decision": old_decision.value,
-            "new_decision": new_decision.value,
-            "admin_action": True,
-            "reason": request.reason
-        }
-        
+
         # Add to Merkle tree for evidence integrity
-        evidence_hash = hashlib.sha256(str(override_evidence).encode()).hexdigest()
-        merkle_leaf = evidence_tree.add_leaf(evidence_hash)
-        
-        # Update transaction with new evidence hash
-        await transaction_crud.update_transaction(
+        evidence_hash = fast_sha256.hexdigest(override_evidence)
+        async with _evidence_tree_lock:
+            merkle_leaf = evidence_tree.add_leaf(evidence_hash)
+
+        # Persist the decision change, new evidence fields, and audit
+        # trail entry in a single write
+        applied = await transaction_crud.apply_override(
             transaction.tx_uuid,
-            {
-                "evidence_hash": evidence_hash,
-                "merkle_leaf": merkle_leaf,
-                "updated_at": datetime.utcnow()
-            }
+            new_decision,
+            evidence_hash,
+            merkle_leaf,
+            audit_entry
         )
-        
-        logger.info(f"Transaction {transaction.tx_uuid} overridden: {old_decision} -> {new_decision}")
+
+        if not applied:
+            raise HTTPException(status_code=500, detail="Failed to apply override")
+
+        logger.info("Transaction %s overridden: %s -> %s", transaction.tx_uuid, old_decision, new_decision)
         
         return OverrideResponse(
             success=True,
@@ -572,5 +671,5 @@ async def override_transaction_decision(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error overriding transaction {request.hash}: {str(e)}")
+        logger.error("Error overriding transaction %s: %s", request.hash, e)
         raise HTTPException(status_code=500, detail="Failed to override transaction")
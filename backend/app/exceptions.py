@@ -3,29 +3,36 @@ Application-wide exception handlers
 """
 import json
 import logging
-import traceback
-import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from secrets import token_hex
 
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
 
 logger = logging.getLogger(__name__)
 
+
+def _now_iso() -> str:
+    """Timezone-aware ISO timestamp (utcnow is deprecated and naive)"""
+    return datetime.now(timezone.utc).isoformat()
+
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """
     Global exception handler that catches all unhandled exceptions
     and returns a structured JSON response with trace ID.
     """
-    # Generate trace ID (use existing one if available)
-    trace_id = getattr(request.state, 'trace_id', str(uuid.uuid4()))
+    # Generate trace ID (use existing one if available); token_hex
+    # skips uuid4's dashed-hex formatting on the fallback path
+    trace_id = getattr(request.state, 'trace_id', None) or token_hex(16)
     
-    # Log the exception with full traceback
+    # Log the exception with full traceback. exc_info defers the frame
+    # walk and formatting to the logging handler, so the traceback is
+    # only rendered when the record is actually emitted, instead of
+    # building the string eagerly via traceback.format_exc().
     logger.error(
-        f"Unhandled exception - trace_id: {trace_id}, "
-        f"method: {request.method}, url: {request.url}, "
-        f"exception: {type(exc).__name__}: {str(exc)}, "
-        f"traceback: {traceback.format_exc()}"
+        "Unhandled exception - trace_id: %s, method: %s, url: %s, exception: %s: %s",
+        trace_id, request.method, request.url, type(exc).__name__, exc,
+        exc_info=exc
     )
     
     # Return structured error response
@@ -35,7 +42,7 @@ async def global_exception_handler(request: Request, exc: Exception) -> JSONResp
             "error": {
                 "status_code": 500,
                 "detail": "Internal server error",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _now_iso(),
                 "trace_id": trace_id,
                 "path": str(request.url.path)
             }
@@ -46,14 +53,14 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     """
     Handler for HTTP exceptions (4xx errors)
     """
-    # Generate trace ID (use existing one if available)
-    trace_id = getattr(request.state, 'trace_id', str(uuid.uuid4()))
+    # Generate trace ID (use existing one if available); token_hex
+    # skips uuid4's dashed-hex formatting on the fallback path
+    trace_id = getattr(request.state, 'trace_id', None) or token_hex(16)
     
     # Log HTTP exceptions
     logger.warning(
-        f"HTTP exception - trace_id: {trace_id}, "
-        f"method: {request.method}, url: {request.url}, "
-        f"status_code: {exc.status_code}, detail: {exc.detail}"
+        "HTTP exception - trace_id: %s, method: %s, url: %s, status_code: %s, detail: %s",
+        trace_id, request.method, request.url, exc.status_code, exc.detail
     )
     
     return JSONResponse(
@@ -62,7 +69,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
             "error": {
                 "status_code": exc.status_code,
                 "detail": exc.detail,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _now_iso(),
                 "trace_id": trace_id,
                 "path": str(request.url.path)
             }
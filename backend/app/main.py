@@ -1,11 +1,17 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+import orjson
+from prometheus_client import make_asgi_app
 import logging
 import os
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from dotenv import load_dotenv
 
 from app.db.mongo import connect_to_mongo, close_mongo_connection
+from app.core.zk_client import close_shared_zk_client
 from app.api.v1 import api_router
 from app.middleware.log_requests import RequestLoggingMiddleware
 from app.exceptions import global_exception_handler, http_exception_handler
@@ -13,11 +19,22 @@ from app.exceptions import global_exception_handler, http_exception_handler
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging. All records are routed through an in-memory queue
+# to a dedicated listener thread, so stderr writes (and the traceback
+# rendering the exception handlers defer via exc_info) happen off the
+# event loop instead of stalling in-flight requests during an error
+# storm.
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
+_log_queue = SimpleQueue()
+_root_logger = logging.getLogger()
+_log_listener = QueueListener(
+    _log_queue, *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [QueueHandler(_log_queue)]
+_log_listener.start()
 logger = logging.getLogger(__name__)
 
 
@@ -31,7 +48,10 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     logger.info("Shutting down Crypto Compliance Copilot Backend")
+    await close_shared_zk_client()
     await close_mongo_connection()
+    # Flush queued log records before the process exits
+    _log_listener.stop()
 
 
 # Create FastAPI app
@@ -39,16 +59,28 @@ app = FastAPI(
     title="Crypto Compliance Copilot API",
     description="Automated compliance checking with MongoDB and blockchain anchoring",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson for every response by default; small dict endpoints like
+    # /health and /merkle/root are dominated by serialization overhead
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS
+# Configure CORS. Explicit origin/method/header lists let the
+# middleware match with set lookups instead of wildcard branches, and
+# max_age lets browsers cache preflights for a day instead of sending
+# an OPTIONS round trip before every cross-origin POST.
+cors_origins = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify exact origins
+    allow_origins=cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "X-Trace-Id"],
+    max_age=86400,
 )
 
 # Add request logging middleware
@@ -59,43 +91,62 @@ app.add_exception_handler(Exception, global_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
 
 
-# Health check endpoint
+# Health check endpoint. The body never changes, and load balancers
+# probe it every few seconds — serialize it once at import and hand the
+# same bytes back, skipping the JSON encoder per probe.
+_HEALTH_BYTES = orjson.dumps({"status": "healthy", "service": "compliance-copilot-backend"})
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for load balancers and monitoring"""
-    return {"status": "healthy", "service": "compliance-copilot-backend"}
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 # Debug endpoint to check MongoDB users
 @app.get("/debug/mongodb-users")
-async def debug_mongodb_users():
-    """Debug endpoint to see what users are stored in MongoDB"""
+async def debug_mongodb_users(limit: int = Query(1000, ge=1, le=100000)):
+    """
+    Debug endpoint to see what users are stored in MongoDB
+
+    Streams one NDJSON line per user straight off the cursor instead
+    of materializing the whole collection in memory, so the probe is
+    constant-memory and starts responding after the first batch. The
+    (estimated) collection count is returned in the
+    X-Mongodb-Users-Count header rather than the body.
+    """
     from app.db.mongo import get_database
-    
+
     try:
         db = await get_database()
         users_collection = db.users
-        
-        # Get all users from MongoDB
-        users_cursor = users_collection.find({}, {"password_hash": 0})  # Exclude password hashes
-        users_list = []
-        
-        async for user in users_cursor:
-            user["_id"] = str(user["_id"])  # Convert ObjectId to string
-            users_list.append(user)
-        
-        return {
-            "mongodb_users_count": len(users_list),
-            "users": users_list
-        }
-        
+        estimated_count = await users_collection.estimated_document_count()
     except Exception as e:
         return {"error": f"Failed to query MongoDB: {str(e)}"}
 
+    async def _stream_users():
+        # Exclude password hashes server-side; batch the cursor so the
+        # driver fetches documents in chunks
+        cursor = users_collection.find(
+            {}, {"password_hash": 0}
+        ).batch_size(500).limit(limit)
+        async for user in cursor:
+            user["_id"] = str(user["_id"])  # Convert ObjectId to string
+            yield orjson.dumps(user) + b"\n"
+
+    return StreamingResponse(
+        _stream_users(),
+        media_type="application/x-ndjson",
+        headers={"X-Mongodb-Users-Count": str(estimated_count)}
+    )
+
 
 # Include API routers
 app.include_router(api_router)
 
+# Prometheus metrics (per-endpoint histograms, counters)
+app.mount("/metrics", make_asgi_app())
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -104,5 +155,9 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        # uvicorn[standard] ships uvloop and httptools; "auto" picks the
+        # C implementations when present and falls back to asyncio/h11
+        loop="auto",
+        http="auto"
     )
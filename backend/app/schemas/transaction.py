@@ -4,10 +4,22 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional, Union
+from bson.decimal128 import Decimal128
 from pydantic import BaseModel, Field, ConfigDict, validator
 
 from app.models.transaction import DecisionEnum
 
+# Amount coercion dispatch, keyed on the exact input type: one dict
+# lookup replaces the isinstance chain, and Decimal128 converts via
+# to_decimal() instead of a str() round-trip
+_AMOUNT_CONVERTERS = {
+    str: Decimal,
+    int: Decimal,
+    float: lambda v: Decimal(str(v)),
+    Decimal128: lambda v: v.to_decimal(),
+    Decimal: lambda v: v,
+}
+
 
 class TransactionSubmitRequest(BaseModel):
     """
@@ -46,12 +58,15 @@ class TransactionSubmitRequest(BaseModel):
     
     @validator('amount', pre=True)
     def convert_amount(cls, v):
-        """Convert amount to Decimal for consistent handling"""
-        if isinstance(v, str):
-            return Decimal(v)
-        elif isinstance(v, (int, float)):
-            return Decimal(str(v))
-        return v
+        """
+        Convert amount to Decimal for consistent handling
+
+        Coercion happens once at parse time so handlers can rely on
+        request.amount already being a Decimal instead of re-checking
+        the input type on the hot path.
+        """
+        converter = _AMOUNT_CONVERTERS.get(type(v))
+        return converter(v) if converter is not None else v
     
     @validator('currency', pre=True, always=True)
     def set_currency(cls, v, values):
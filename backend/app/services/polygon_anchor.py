@@ -11,7 +11,8 @@ import json
 import asyncio
 import logging
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
 from web3 import Web3, HTTPProvider
 from web3.contract import Contract
 from eth_account import Account
@@ -20,6 +21,47 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# RPC providers commonly cap eth_getLogs queries at a few thousand blocks,
+# so event queries are paginated into windows of this size.
+BLOCK_PAGE_SIZE = 2000
+
+# Splitting policy for eth_getLogs pagination: only provider complaints
+# about the range being too wide or the response too large are worth
+# retrying with smaller windows — anything else (dead provider, timeout)
+# re-raises immediately instead of cascading into thousands of failing
+# calls. Windows are never split below MIN_EVENT_WINDOW blocks.
+MIN_EVENT_WINDOW = 64
+_SPLITTABLE_LOG_ERRORS = (
+    "more than",        # "query returned more than 10000 results"
+    "block range",      # "block range is too large" / "exceeds max block range"
+    "too large",
+    "response size",
+    "limit exceeded",
+)
+
+# topic0 of the RootAnchored event, precomputed so single-block lookups can
+# filter server-side instead of decoding unrelated logs in-process
+ROOT_ANCHORED_TOPIC0 = Web3.keccak(text="RootAnchored(bytes32,uint256,address)").hex()
+
+# One pooled HTTP session shared by every Web3 provider in the process, so
+# RPC calls reuse keep-alive connections instead of paying a TCP/TLS
+# handshake each time
+_http_session: Optional[requests.Session] = None
+
+
+def _get_http_session() -> requests.Session:
+    """Get the shared keep-alive session for RPC providers"""
+    global _http_session
+
+    if _http_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _http_session = session
+
+    return _http_session
+
 class PolygonAnchorError(Exception):
     """Custom exception for Polygon anchor operations"""
     pass
@@ -51,8 +93,8 @@ class PolygonAnchorService:
         if not self.contract_address:
             raise PolygonAnchorError("CONTRACT_ADDRESS environment variable required")
         
-        # Initialize Web3
-        self.w3 = Web3(HTTPProvider(self.rpc_url))
+        # Initialize Web3 with the shared keep-alive session
+        self.w3 = Web3(self._build_provider())
         
         # Check connection
         if not self.w3.is_connected():
@@ -71,6 +113,13 @@ class PolygonAnchorService:
                 "stateMutability": "nonpayable",
                 "type": "function"
             },
+            {
+                "inputs": [{"internalType": "bytes32[]", "name": "roots", "type": "bytes32[]"}],
+                "name": "anchorRoots",
+                "outputs": [],
+                "stateMutability": "nonpayable",
+                "type": "function"
+            },
             {
                 "inputs": [],
                 "name": "owner",
@@ -99,6 +148,14 @@ class PolygonAnchorService:
         
         self._contract = None
         
+    def _build_provider(self) -> HTTPProvider:
+        """Build an HTTP provider backed by the shared connection pool"""
+        return HTTPProvider(
+            self.rpc_url,
+            session=_get_http_session(),
+            request_kwargs={"timeout": 10}
+        )
+
     def get_contract(self) -> Contract:
         """
         Get the contract instance with retry logic
@@ -113,7 +170,7 @@ class PolygonAnchorService:
             try:
                 if not self.w3.is_connected():
                     # Try to reconnect
-                    self.w3 = Web3(HTTPProvider(self.rpc_url))
+                    self.w3 = Web3(self._build_provider())
                     if not self.w3.is_connected():
                         raise PolygonAnchorError(f"Cannot connect to {self.rpc_url}")
                 
@@ -134,22 +191,27 @@ class PolygonAnchorService:
                 
         return self._contract
     
-    def _ensure_hex_format(self, root: str) -> str:
+    def _ensure_hex_format(self, root) -> str:
         """
         Ensure root is in proper hex format
-        
+
         Args:
-            root: Root hash as string
-            
+            root: Root hash as hex string or raw 32 bytes
+
         Returns:
             Properly formatted hex string
         """
+        if isinstance(root, (bytes, bytearray)):
+            if len(root) != 32:
+                raise ValueError(f"Invalid root length: {len(root)} bytes, expected 32")
+            return "0x" + root.hex()
+
         if not root.startswith("0x"):
             root = "0x" + root
-            
+
         if len(root) != 66:  # 0x + 64 hex chars
             raise ValueError(f"Invalid root hash length: {len(root)}, expected 66")
-            
+
         return root
     
     def anchor_root(self, root_hex: str, max_retries: int = 3) -> Dict[str, Any]:
@@ -173,9 +235,11 @@ class PolygonAnchorService:
             try:
                 contract = self.get_contract()
                 
-                # Get current nonce
-                nonce = self.w3.eth.get_transaction_count(self.account.address)
-                
+                # Get current nonce, counting pending transactions so a
+                # submit issued while an earlier anchor is still in the
+                # mempool doesn't reuse its nonce
+                nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+
                 # Build transaction
                 tx_data = contract.functions.anchorRoot(root_hex).build_transaction({
                     'from': self.account.address,
@@ -207,7 +271,7 @@ class PolygonAnchorService:
                     "block_number": receipt.blockNumber,
                     "gas_used": receipt.gasUsed,
                     "root": root_hex,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": int(time.time()),
                     "anchored_by": self.account.address,
                     "events": events
                 }
@@ -226,47 +290,229 @@ class PolygonAnchorService:
                 else:
                     raise PolygonAnchorError(f"Failed to anchor root after {max_retries + 1} attempts: {e}")
     
+    def submit_anchor(self, root_hex: str) -> str:
+        """
+        Sign and send an anchor transaction without waiting for the receipt
+
+        Args:
+            root_hex: Merkle root hash (with or without 0x prefix)
+
+        Returns:
+            Transaction hash of the submitted transaction
+
+        Raises:
+            PolygonAnchorError: If submission fails
+        """
+        root_hex = self._ensure_hex_format(root_hex)
+
+        try:
+            contract = self.get_contract()
+
+            # Count pending transactions: fire-and-forget submissions
+            # return before mining, so the next submit must see them
+            nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+
+            tx_data = contract.functions.anchorRoot(root_hex).build_transaction({
+                'from': self.account.address,
+                'nonce': nonce,
+                'gas': 100000,  # Conservative gas limit
+                'gasPrice': self.w3.eth.gas_price,
+                'chainId': self.w3.eth.chain_id
+            })
+
+            signed_tx = self.account.sign_transaction(tx_data)
+            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+
+            logger.info(f"Anchor transaction submitted: {tx_hash.hex()}")
+            return tx_hash.hex()
+
+        except Exception as e:
+            raise PolygonAnchorError(f"Failed to submit anchor transaction: {e}")
+
+    def wait_for_anchor(self, tx_hash: str, root_hex: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Wait for a submitted anchor transaction to be mined
+
+        Args:
+            tx_hash: Transaction hash returned by submit_anchor
+            root_hex: Root that was anchored (included in the result)
+
+        Returns:
+            Dict containing transaction details and event information
+
+        Raises:
+            PolygonAnchorError: If the transaction fails or times out
+        """
+        try:
+            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+
+            if receipt.status != 1:
+                raise PolygonAnchorError(f"Transaction failed: {tx_hash}")
+
+            events = self._parse_events(self.get_contract(), receipt)
+
+            return {
+                "success": True,
+                "tx_hash": receipt.transactionHash.hex(),
+                "block_number": receipt.blockNumber,
+                "gas_used": receipt.gasUsed,
+                "root": root_hex,
+                "timestamp": int(time.time()),
+                "anchored_by": self.account.address,
+                "events": events
+            }
+
+        except PolygonAnchorError:
+            raise
+        except Exception as e:
+            raise PolygonAnchorError(f"Failed waiting for anchor transaction: {e}")
+
+    def anchor_roots(self, roots: List[Any], max_retries: int = 3) -> Dict[str, Any]:
+        """
+        Anchor multiple Merkle roots in a single batched transaction
+
+        Amortizes nonce/gas-price queries and base transaction gas across
+        the whole batch via the contract's anchorRoots method.
+
+        Args:
+            roots: Merkle root hashes (hex strings or raw bytes)
+            max_retries: Maximum number of retry attempts
+
+        Returns:
+            Dict containing transaction details and event information
+
+        Raises:
+            PolygonAnchorError: If anchoring fails after retries
+        """
+        if not roots:
+            raise ValueError("Roots cannot be empty")
+
+        roots_hex = [self._ensure_hex_format(root) for root in roots]
+        logger.info(f"Anchoring batch of {len(roots_hex)} roots")
+
+        for attempt in range(max_retries + 1):
+            try:
+                contract = self.get_contract()
+
+                # Get current nonce, counting pending transactions so
+                # in-flight fire-and-forget anchors are not overwritten
+                nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
+
+                # Build transaction; gas grows with batch size
+                tx_data = contract.functions.anchorRoots(roots_hex).build_transaction({
+                    'from': self.account.address,
+                    'nonce': nonce,
+                    'gas': 50000 + 30000 * len(roots_hex),
+                    'gasPrice': self.w3.eth.gas_price,
+                    'chainId': self.w3.eth.chain_id
+                })
+
+                # Sign transaction
+                signed_tx = self.account.sign_transaction(tx_data)
+
+                # Send transaction
+                tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+                logger.info(f"Batch transaction sent: {tx_hash.hex()}")
+
+                # Wait for receipt
+                receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+
+                if receipt.status != 1:
+                    raise PolygonAnchorError(f"Transaction failed: {tx_hash.hex()}")
+
+                # Parse events
+                events = self._parse_events(contract, receipt)
+
+                result = {
+                    "success": True,
+                    "tx_hash": receipt.transactionHash.hex(),
+                    "block_number": receipt.blockNumber,
+                    "gas_used": receipt.gasUsed,
+                    "roots": roots_hex,
+                    "timestamp": int(time.time()),
+                    "anchored_by": self.account.address,
+                    "events": events
+                }
+
+                logger.info(f"Batch of {len(roots_hex)} roots anchored: {tx_hash.hex()}")
+                return result
+
+            except Exception as e:
+                logger.warning(f"Batch anchor attempt {attempt + 1} failed: {e}")
+
+                if attempt < max_retries:
+                    wait_time = 2 ** attempt  # Exponential backoff
+                    logger.info(f"Retrying in {wait_time} seconds...")
+                    time.sleep(wait_time)
+                    self._contract = None  # Force contract reload
+                else:
+                    raise PolygonAnchorError(f"Failed to anchor roots after {max_retries + 1} attempts: {e}")
+
     def get_events(
         self,
         from_block: Optional[int] = None,
         to_block: str = "latest",
-        limit: int = 100
+        limit: int = 100,
+        block_hash: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Fetch RootAnchored events from the blockchain
-        
+
         Args:
             from_block: Starting block number (None for earliest)
             to_block: Ending block ("latest" for current)
             limit: Maximum number of events to return
-            
+            block_hash: Fetch events from this single block only; skips
+                range scanning entirely on the node
+
         Returns:
             List of event dictionaries
-            
+
         Raises:
             PolygonAnchorError: If event fetching fails
         """
         try:
             contract = self.get_contract()
-            
-            # Set default from_block if not provided
-            if from_block is None:
-                current_block = self.w3.eth.block_number
-                from_block = max(0, current_block - 10000)  # Last 10k blocks
-            
-            logger.info(f"Fetching events from block {from_block} to {to_block}")
-            
-            # Get events
-            event_filter = contract.events.RootAnchored.create_filter(
-                fromBlock=from_block,
-                toBlock=to_block
-            )
-            
-            events = event_filter.get_all_entries()
-            
+
+            if block_hash is not None:
+                # blockHash lookups are single-block reads on the node and
+                # the topic filter keeps unrelated logs server-side
+                logs = self.w3.eth.get_logs({
+                    "address": self.contract_address,
+                    "topics": [ROOT_ANCHORED_TOPIC0],
+                    "blockHash": block_hash
+                })
+                raw_events = [
+                    contract.events.RootAnchored().process_log(log)
+                    for log in logs
+                ]
+            else:
+                # Resolve "latest" to a concrete block so the range can be
+                # split into provider-sized windows
+                if to_block == "latest" or to_block is None:
+                    end_block = self.w3.eth.block_number
+                else:
+                    end_block = int(to_block)
+
+                # Set default from_block if not provided
+                if from_block is None:
+                    from_block = max(0, end_block - 10000)  # Last 10k blocks
+
+                logger.info(f"Fetching events from block {from_block} to {end_block}")
+
+                # Walk windows newest-first so the most recent `limit` events
+                # are found without scanning the whole range
+                raw_events = []
+                window_end = end_block
+                while window_end >= from_block and len(raw_events) < limit:
+                    window_start = max(from_block, window_end - BLOCK_PAGE_SIZE + 1)
+                    page = self._fetch_event_window(contract, window_start, window_end)
+                    raw_events = list(page) + raw_events
+                    window_end = window_start - 1
+
             # Process and format events
             formatted_events = []
-            for event in events[-limit:]:  # Take last N events
+            for event in raw_events[-limit:]:  # Take last N events
                 formatted_event = {
                     "root": event.args.root.hex(),
                     "timestamp": event.args.timestamp,
@@ -276,12 +522,50 @@ class PolygonAnchorService:
                     "log_index": event.logIndex
                 }
                 formatted_events.append(formatted_event)
-            
+
             logger.info(f"Retrieved {len(formatted_events)} events")
             return formatted_events
-            
+
         except Exception as e:
             raise PolygonAnchorError(f"Failed to fetch events: {e}")
+
+    def _fetch_event_window(self, contract: Contract, start_block: int, end_block: int) -> List[Any]:
+        """
+        Fetch RootAnchored events for a single block window
+
+        Retries by halving the window when the provider rejects it as too
+        wide or the response as too large (matched against
+        _SPLITTABLE_LOG_ERRORS), down to MIN_EVENT_WINDOW blocks. Every
+        other error — a dead provider, a timeout — re-raises immediately
+        so a failing query cannot fan out into thousands of failing calls.
+
+        Args:
+            contract: Contract instance
+            start_block: First block in the window
+            end_block: Last block in the window
+
+        Returns:
+            List of raw event entries in chronological order
+        """
+        try:
+            event_filter = contract.events.RootAnchored.create_filter(
+                fromBlock=start_block,
+                toBlock=end_block
+            )
+            return event_filter.get_all_entries()
+        except Exception as e:
+            message = str(e).lower()
+            splittable = any(marker in message for marker in _SPLITTABLE_LOG_ERRORS)
+            if splittable and end_block - start_block + 1 > MIN_EVENT_WINDOW:
+                mid_block = (start_block + end_block) // 2
+                logger.warning(
+                    f"Event window [{start_block}, {end_block}] failed ({e}), retrying in halves"
+                )
+                return (
+                    self._fetch_event_window(contract, start_block, mid_block)
+                    + self._fetch_event_window(contract, mid_block + 1, end_block)
+                )
+            raise
     
     def _parse_events(self, contract: Contract, receipt) -> List[Dict[str, Any]]:
         """
@@ -314,6 +598,33 @@ class PolygonAnchorService:
                 
         return events
     
+    def get_contract_info(self) -> Dict[str, Any]:
+        """
+        Get static contract metadata
+
+        Reads only the effectively-immutable contract constants, unlike
+        health_check() which also queries balance and latest block.
+
+        Returns:
+            Contract metadata dictionary
+
+        Raises:
+            PolygonAnchorError: If the contract cannot be reached
+        """
+        try:
+            contract = self.get_contract()
+
+            return {
+                "contract_address": self.contract_address,
+                "version": contract.functions.version().call(),
+                "owner": contract.functions.owner().call(),
+                "chain_id": self.w3.eth.chain_id,
+                "rpc_url": self.rpc_url
+            }
+
+        except Exception as e:
+            raise PolygonAnchorError(f"Failed to get contract info: {e}")
+
     def health_check(self) -> Dict[str, Any]:
         """
         Check service health and connectivity
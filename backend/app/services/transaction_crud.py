@@ -3,7 +3,7 @@
 import logging
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
 from pymongo.errors import DuplicateKeyError
@@ -13,6 +13,26 @@ from app.models.transaction import TransactionModel, DecisionEnum
 
 logger = logging.getLogger(__name__)
 
+# Fields the list endpoints actually return; projecting to these keeps
+# potentially large subdocuments (the reviews audit trail, KYC payloads)
+# off the wire on every page load
+LIST_PROJECTION = {
+    "tx_uuid": 1,
+    "wallet_from": 1,
+    "wallet_to": 1,
+    "amount": 1,
+    "currency": 1,
+    "tx_hash": 1,
+    "memo": 1,
+    "kyc_proof_id": 1,
+    "decision": 1,
+    "evidence_hash": 1,
+    "merkle_leaf": 1,
+    "anchored_root": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
 
 class TransactionCRUD:
     """CRUD operations for transactions in MongoDB"""
@@ -175,24 +195,109 @@ class TransactionCRUD:
             logger.error(f"Failed to add audit entry to transaction {tx_uuid}: {e}")
             raise
 
+    async def iter_transactions(
+        self,
+        limit: int = 50,
+        skip: int = 0,
+        decision: Optional[DecisionEnum] = None,
+        projection: Optional[dict] = None
+    ):
+        """
+        Get an async cursor over transactions for streaming consumers
+
+        Unlike list_transactions this does not materialize the page into
+        a list; callers iterate rows straight off the Motor cursor.
+
+        Args:
+            limit: Maximum number of transactions to yield
+            skip: Number of transactions to skip
+            decision: Filter by decision status
+            projection: Optional field projection (e.g. LIST_PROJECTION)
+
+        Returns:
+            AsyncIOMotorCursor over the matching raw documents
+        """
+        collection = await self.get_collection()
+
+        filter_query = {}
+        if decision:
+            filter_query["decision"] = decision.value
+
+        return collection.find(filter_query, projection).sort("created_at", -1).skip(skip).limit(limit)
+
+    async def apply_override(
+        self,
+        tx_uuid: str,
+        decision: DecisionEnum,
+        evidence_hash: str,
+        merkle_leaf: str,
+        audit_entry: dict
+    ) -> bool:
+        """
+        Apply a manual override in a single write
+
+        Combines the decision change, the new evidence fields, and the
+        audit-trail append into one update_one so an override costs one
+        MongoDB round-trip instead of three.
+
+        Args:
+            tx_uuid: Transaction UUID
+            decision: New decision to apply
+            evidence_hash: Evidence hash for the override
+            merkle_leaf: Merkle leaf computed for the override evidence
+            audit_entry: Audit entry to append to the reviews array
+
+        Returns:
+            bool: True if the transaction was updated
+        """
+        try:
+            collection = await self.get_collection()
+
+            result = await collection.update_one(
+                {"tx_uuid": tx_uuid},
+                {
+                    "$set": {
+                        "decision": decision.value if isinstance(decision, DecisionEnum) else decision,
+                        "evidence_hash": evidence_hash,
+                        "merkle_leaf": merkle_leaf,
+                        "updated_at": datetime.utcnow()
+                    },
+                    "$push": {"reviews": audit_entry}
+                }
+            )
+
+            success = result.modified_count == 1
+            if success:
+                logger.info(f"Applied override to transaction {tx_uuid}")
+            else:
+                logger.warning(f"Failed to apply override - transaction {tx_uuid} not found")
+
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to apply override to transaction {tx_uuid}: {e}")
+            raise
+
     async def list_transactions(
         self, 
         limit: int = 50, 
         skip: int = 0,
         decision: Optional[DecisionEnum] = None,
         wallet_from: Optional[str] = None,
-        wallet_to: Optional[str] = None
+        wallet_to: Optional[str] = None,
+        projection: Optional[dict] = None
     ) -> List[TransactionModel]:
         """
         List transactions with optional filtering
-        
+
         Args:
             limit: Maximum number of transactions to return
             skip: Number of transactions to skip
             decision: Filter by decision status
             wallet_from: Filter by source wallet
             wallet_to: Filter by destination wallet
-            
+            projection: Optional field projection (e.g. LIST_PROJECTION)
+
         Returns:
             List[TransactionModel]: List of transactions
         """
@@ -209,7 +314,7 @@ class TransactionCRUD:
                 filter_query["wallet_to"] = wallet_to
             
             # Execute query with sorting (latest first)
-            cursor = collection.find(filter_query).sort("created_at", -1).skip(skip).limit(limit)
+            cursor = collection.find(filter_query, projection).sort("created_at", -1).skip(skip).limit(limit)
             docs = await cursor.to_list(length=limit)
             
             # Convert to models
@@ -222,6 +327,60 @@ class TransactionCRUD:
             logger.error(f"Failed to list transactions: {e}")
             raise
     
+    async def list_with_count(
+        self,
+        limit: int = 50,
+        skip: int = 0,
+        decision: Optional[DecisionEnum] = None
+    ) -> Tuple[List[TransactionModel], int]:
+        """
+        List transactions and their total count in a single round-trip
+
+        Uses a $facet aggregation so the page of rows and the matching
+        count come back from one query instead of separate find + count
+        round-trips.
+
+        Args:
+            limit: Maximum number of transactions to return
+            skip: Number of transactions to skip
+            decision: Filter by decision status
+
+        Returns:
+            Tuple of (transactions, total matching count)
+        """
+        try:
+            collection = await self.get_collection()
+
+            match_query = {}
+            if decision:
+                match_query["decision"] = decision.value
+
+            pipeline = [
+                {"$match": match_query},
+                {"$sort": {"created_at": -1}},
+                {"$facet": {
+                    "items": [
+                        {"$skip": skip},
+                        {"$limit": limit},
+                        {"$project": LIST_PROJECTION}
+                    ],
+                    "total": [{"$count": "n"}]
+                }}
+            ]
+
+            results = await collection.aggregate(pipeline).to_list(length=1)
+            facet = results[0] if results else {"items": [], "total": []}
+
+            transactions = [TransactionModel.from_dict(doc) for doc in facet["items"]]
+            total = facet["total"][0]["n"] if facet["total"] else 0
+
+            logger.info(f"Retrieved {len(transactions)} of {total} transactions")
+            return transactions, total
+
+        except Exception as e:
+            logger.error(f"Failed to list transactions with count: {e}")
+            raise
+
     async def update_transaction(
         self, 
         transaction_id: str, 
@@ -217,10 +217,21 @@ class TestAnchorAPI:
     @pytest.fixture
     def mock_anchor_service(self):
         """Mock the anchor service"""
+        import app.api.v1.anchor as anchor_module
+
+        anchor_module.get_anchor_service.cache_clear()
+        anchor_module._health_cache = None
+        anchor_module._chain_id_cache = None
+        anchor_module._events_cache.clear()
+        anchor_module._contract_info_cache = None
+        anchor_module._pending_anchors.clear()
         with patch('app.api.v1.anchor.create_anchor_service') as mock_create:
             mock_service = Mock()
             mock_create.return_value = mock_service
             yield mock_service
+        anchor_module.get_anchor_service.cache_clear()
+        anchor_module._health_cache = None
+        anchor_module._chain_id_cache = None
     
     def test_anchor_root_endpoint_success(self, client, mock_anchor_service):
         """Test successful root anchoring via API"""
@@ -231,13 +242,13 @@ class TestAnchorAPI:
             "block_number": 1001,
             "gas_used": 50000,
             "root": TEST_ROOT,
-            "timestamp": "2021-01-01T00:00:00",
+            "timestamp": 1609459200,
             "anchored_by": "0x" + "1" * 40,
             "events": []
         }
         
         response = client.post(
-            "/v1/anchor/root",
+            "/v1/anchor/root?wait=true",
             json={"root": TEST_ROOT}
         )
         
@@ -261,13 +272,95 @@ class TestAnchorAPI:
         mock_anchor_service.anchor_root.side_effect = PolygonAnchorError("Service error")
         
         response = client.post(
-            "/v1/anchor/root",
+            "/v1/anchor/root?wait=true",
             json={"root": TEST_ROOT}
         )
         
         assert response.status_code == 500
         assert "Anchoring failed" in response.json()["detail"]
     
+    def test_anchor_root_endpoint_async_submit(self, client, mock_anchor_service):
+        """Test fire-and-forget anchoring returns 202 with the tx hash"""
+        tx_hash = "0x" + "c" * 64
+        mock_anchor_service.submit_anchor.return_value = tx_hash
+        mock_anchor_service.wait_for_anchor.return_value = {
+            "success": True,
+            "tx_hash": tx_hash,
+            "block_number": 1001,
+            "gas_used": 50000,
+            "root": TEST_ROOT,
+            "timestamp": 1609459200,
+            "anchored_by": "0x" + "1" * 40,
+            "events": []
+        }
+
+        response = client.post(
+            "/v1/anchor/root",
+            json={"root": TEST_ROOT}
+        )
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["tx_hash"] == tx_hash
+        assert data["status"] == "pending"
+
+    def test_anchor_root_status_endpoint(self, client, mock_anchor_service):
+        """Test status polling for a submitted anchor transaction"""
+        import app.api.v1.anchor as anchor_module
+
+        tx_hash = "0x" + "d" * 64
+        anchor_module._pending_anchors[tx_hash] = {
+            "tx_hash": tx_hash,
+            "root": TEST_ROOT,
+            "status": "pending"
+        }
+
+        response = client.get(f"/v1/anchor/root/status/{tx_hash}")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["tx_hash"] == tx_hash
+        assert data["status"] == "pending"
+
+    def test_anchor_root_status_endpoint_unknown(self, client, mock_anchor_service):
+        """Test status polling for an untracked transaction"""
+        response = client.get("/v1/anchor/root/status/" + "0x" + "e" * 64)
+
+        assert response.status_code == 404
+
+    def test_anchor_roots_endpoint_success(self, client, mock_anchor_service):
+        """Test batch root anchoring via API"""
+        mock_anchor_service.anchor_roots.return_value = {
+            "success": True,
+            "tx_hash": "0x" + "b" * 64,
+            "block_number": 1002,
+            "gas_used": 90000,
+            "roots": [TEST_ROOT],
+            "timestamp": 1609459200,
+            "anchored_by": "0x" + "1" * 40,
+            "events": []
+        }
+
+        response = client.post(
+            "/v1/anchor/roots",
+            json={"roots": [TEST_ROOT]}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["tx_hash"] == "0x" + "b" * 64
+        assert data["roots"] == [TEST_ROOT]
+
+    def test_anchor_roots_endpoint_empty_batch(self, client, mock_anchor_service):
+        """Test batch anchoring rejects an empty batch"""
+        response = client.post(
+            "/v1/anchor/roots",
+            json={"roots": []}
+        )
+
+        assert response.status_code == 422  # Validation error
+
     def test_get_events_endpoint_success(self, client, mock_anchor_service):
         """Test successful event retrieval via API"""
         mock_anchor_service.get_events.return_value = [
@@ -323,13 +416,11 @@ class TestAnchorAPI:
     
     def test_contract_info_endpoint(self, client, mock_anchor_service):
         """Test contract info endpoint"""
-        mock_anchor_service.health_check.return_value = {
-            "healthy": True,
+        mock_anchor_service.get_contract_info.return_value = {
             "contract_address": TEST_CONTRACT_ADDRESS,
-            "contract_version": "1.0.0",
-            "contract_owner": "0x" + "1" * 40,
+            "version": "1.0.0",
+            "owner": "0x" + "1" * 40,
             "chain_id": 31337,
-            "latest_block": 1000,
             "rpc_url": TEST_RPC_URL
         }
         
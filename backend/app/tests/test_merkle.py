@@ -93,7 +93,10 @@ class TestMerkleProof:
         
         leaf1_hash = hashlib.sha256("data1".encode()).hexdigest()
         leaf2_hash = hashlib.sha256("data2".encode()).hexdigest()
-        root_hash = hashlib.sha256((leaf1_hash + leaf2_hash).encode()).hexdigest()
+        # Interior nodes hash the raw digest pair, not the hex strings
+        root_hash = hashlib.sha256(
+            bytes.fromhex(leaf1_hash) + bytes.fromhex(leaf2_hash)
+        ).hexdigest()
         
         # Proof for leaf1 (sibling is leaf2)
         proof = MerkleProof(
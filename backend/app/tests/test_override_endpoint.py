@@ -36,8 +36,7 @@ class TestOverrideEndpoint:
     async def test_override_success_pass(self, mock_transaction):
         """Test successful override from HOLD to PASS"""
         with patch.object(transaction_crud, 'get_transaction_by_hash', return_value=mock_transaction), \
-             patch.object(transaction_crud, 'add_review_audit', return_value=True), \
-             patch.object(transaction_crud, 'update_transaction', return_value=True), \
+             patch.object(transaction_crud, 'apply_override', return_value=True), \
              patch('app.api.v1.transactions.evidence_tree') as mock_evidence_tree:
             
             mock_evidence_tree.add_leaf.return_value = "merkle_leaf_123"
@@ -74,8 +73,7 @@ class TestOverrideEndpoint:
     async def test_override_success_reject(self, mock_transaction):
         """Test successful override from HOLD to REJECT"""
         with patch.object(transaction_crud, 'get_transaction_by_hash', return_value=mock_transaction), \
-             patch.object(transaction_crud, 'add_review_audit', return_value=True), \
-             patch.object(transaction_crud, 'update_transaction', return_value=True), \
+             patch.object(transaction_crud, 'apply_override', return_value=True), \
              patch('app.api.v1.transactions.evidence_tree') as mock_evidence_tree:
             
             mock_evidence_tree.add_leaf.return_value = "merkle_leaf_456"
@@ -177,8 +175,7 @@ class TestOverrideEndpoint:
             )
             
             with patch.object(transaction_crud, 'get_transaction_by_hash', return_value=test_transaction), \
-                 patch.object(transaction_crud, 'add_review_audit', return_value=True), \
-                 patch.object(transaction_crud, 'update_transaction', return_value=True), \
+                 patch.object(transaction_crud, 'apply_override', return_value=True), \
                  patch('app.api.v1.transactions.evidence_tree') as mock_evidence_tree:
                 
                 mock_evidence_tree.add_leaf.return_value = "merkle_leaf_test"
@@ -279,50 +276,32 @@ class TestOverrideEndpoint:
         assert data["old_decision"] == "PASS"
         assert data["new_decision"] == "PASS"
 
-    async def test_override_audit_failure(self, mock_transaction):
-        """Test override when audit entry fails to add"""
+    async def test_override_apply_failure(self, mock_transaction):
+        """Test override when the combined persist write fails"""
         with patch.object(transaction_crud, 'get_transaction_by_hash', return_value=mock_transaction), \
-             patch.object(transaction_crud, 'add_review_audit', return_value=False):  # Audit fails
-            
-            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-                response = await client.post(
-                    "/v1/override",
-                    json={
-                        "hash": "123e4567-e89b-12d3-a456-426614174000",
-                        "status": "pass",
-                        "reason": "Should fail on audit"
-                    },
-                    headers={"X-Admin-API-Key": "admin_key_12345"}
-                )
-        
-        assert response.status_code == 500
-        assert "Failed to add audit entry" in response.json()["error"]["detail"]
+             patch.object(transaction_crud, 'apply_override', return_value=False), \
+             patch('app.api.v1.transactions.evidence_tree') as mock_evidence_tree:  # Write fails
+
+            mock_evidence_tree.add_leaf.return_value = "merkle_leaf_fail"
 
-    async def test_override_update_failure(self, mock_transaction):
-        """Test override when transaction update fails"""
-        with patch.object(transaction_crud, 'get_transaction_by_hash', return_value=mock_transaction), \
-             patch.object(transaction_crud, 'add_review_audit', return_value=True), \
-             patch.object(transaction_crud, 'update_transaction', return_value=False):  # Update fails
-            
             async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
                 response = await client.post(
                     "/v1/override",
                     json={
                         "hash": "123e4567-e89b-12d3-a456-426614174000",
                         "status": "pass",
-                        "reason": "Should fail on update"
+                        "reason": "Should fail on persist"
                     },
                     headers={"X-Admin-API-Key": "admin_key_12345"}
                 )
-        
+
         assert response.status_code == 500
-        assert "Failed to update transaction decision" in response.json()["error"]["detail"]
+        assert "Failed to apply override" in response.json()["error"]["detail"]
 
     async def test_override_merkle_integration(self, mock_transaction):
         """Test that Merkle tree integration works correctly"""
         with patch.object(transaction_crud, 'get_transaction_by_hash', return_value=mock_transaction), \
-             patch.object(transaction_crud, 'add_review_audit', return_value=True), \
-             patch.object(transaction_crud, 'update_transaction', return_value=True), \
+             patch.object(transaction_crud, 'apply_override', return_value=True), \
              patch('app.api.v1.transactions.evidence_tree') as mock_evidence_tree:
             
             mock_evidence_tree.add_leaf.return_value = "merkle_leaf_evidence_123"
@@ -371,8 +350,7 @@ class TestOverrideEndpoint:
             )
             
             with patch.object(transaction_crud, 'get_transaction_by_hash', return_value=test_transaction), \
-                 patch.object(transaction_crud, 'add_review_audit', return_value=True), \
-                 patch.object(transaction_crud, 'update_transaction', return_value=True), \
+                 patch.object(transaction_crud, 'apply_override', return_value=True), \
                  patch('app.api.v1.transactions.evidence_tree') as mock_evidence_tree:
                 
                 mock_evidence_tree.add_leaf.return_value = f"merkle_leaf_{i}"
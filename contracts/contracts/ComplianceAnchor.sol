@@ -41,6 +41,21 @@ contract ComplianceAnchor {
         emit RootAnchored(root, block.timestamp, msg.sender);
     }
 
+    /**
+     * @dev Anchor multiple Merkle roots in a single transaction
+     * @param roots The Merkle root hashes to anchor
+     * @notice Amortizes base transaction gas across all roots in the batch
+     */
+    function anchorRoots(bytes32[] calldata roots) external {
+        require(roots.length > 0, "Roots cannot be empty");
+
+        for (uint256 i = 0; i < roots.length; i++) {
+            require(roots[i] != bytes32(0), "Root cannot be zero");
+
+            emit RootAnchored(roots[i], block.timestamp, msg.sender);
+        }
+    }
+
     /**
      * @dev Owner-only version of anchorRoot for restricted access
      * @param root The Merkle root hash to anchor